@@ -1,23 +1,35 @@
+import os
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+from collections import Counter
 import streamlit as st
-from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpStatus
-import json
 from dataclasses import dataclass
-from typing import List, Dict, Optional
-import plotly.express as px
-import io
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import tempfile
 from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font, Border, Side, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
-import openpyxl.styles
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.styles import PatternFill, Font, Alignment
 
 # ================================
 # MODELE DE DONNEES
 # ================================
 
-@dataclass
+# Semaine de référence, partagée par le modèle et l'interface
+_JOURS = ('Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche')
+
+# Jours hebdomadaires imposés par chaque type de contrat
+_JOURS_PAR_CONTRAT = {
+    'temps_plein': 5,
+    'mi_temps_4j': 4,
+    'mi_temps_3j': 3,
+    'nuit': 5,
+}
+
+
+@dataclass(slots=True)
 class Employee:
     prenom: str
     nom: str
@@ -25,40 +37,152 @@ class Employee:
     jours_semaine: int
     role: str
     contraintes_speciales: Dict
-    competences: List[str]
+    competences: Tuple[str, ...]
     disponible: bool = True  # Nouveau : disponibilité
     motif_indisponibilite: str = ""  # Nouveau : raison si indisponible
     jours_absence: int = 0  # Nouveau : nombre de jours d'absence dans la semaine (0-7)
     jours_off_consecutifs: Optional[bool] = None
 
     def __post_init__(self):
-        if self.type_contrat == 'temps_plein':
-            self.jours_semaine = 5
-        elif self.type_contrat == 'mi_temps_4j':
-            self.jours_semaine = 4
-        elif self.type_contrat == 'mi_temps_3j':
-            self.jours_semaine = 3
-        elif self.type_contrat == 'nuit':
-            self.jours_semaine = 5
+        # Tuple immuable : partageable entre employés et hashable pour les caches
+        self.competences = tuple(self.competences)
+        self.jours_semaine = _JOURS_PAR_CONTRAT.get(self.type_contrat, self.jours_semaine)
 
     @property
     def jours_travail_max_semaine(self):
         """Calcule le nombre maximum de jours de travail possible cette semaine"""
-        if not self.disponible:
-            return 0
-        elif self.jours_absence >= 7:
-            return 0
-        else:
-            # Jours contractuels moins les jours d'absence, minimum 0
-            return max(0, self.jours_semaine - self.jours_absence)
+        return _jours_travail_max(self.disponible, self.jours_absence, self.jours_semaine)
+
+
+def _masques_off_consecutifs() -> frozenset:
+    """Motifs de jours off autorisés : un seul bloc contigu sur 7 bits.
+
+    Le bloc peut chevaucher le dimanche->lundi (semaine cyclique). Le test
+    d'un motif se réduit alors à une appartenance dans ce frozenset.
+    """
+    masques = {0, 0b1111111}
+    for debut in range(7):
+        for longueur in range(1, 7):
+            motif = 0
+            for k in range(longueur):
+                motif |= 1 << ((debut + k) % 7)
+            masques.add(motif)
+    return frozenset(masques)
+
+
+_MASQUES_OFF_CONSECUTIFS = _masques_off_consecutifs()
+
+
+@lru_cache(maxsize=32)
+def _dates_semaine(semaine_debut) -> Tuple[str, ...]:
+    """Les 7 dates de la semaine (format jj/mm) à partir du lundi donné, mémoïsées"""
+    return tuple(d.strftime('%d/%m') for d in pd.date_range(semaine_debut, periods=7))
+
+
+@lru_cache(maxsize=128)
+def _jours_travail_max(disponible: bool, jours_absence: int, jours_semaine: int) -> int:
+    """Jours contractuels moins les jours d'absence, minimum 0"""
+    if not disponible or jours_absence >= 7:
+        return 0
+    return max(0, jours_semaine - jours_absence)
+
+# Styles openpyxl partagés : instanciés une seule fois au chargement du module,
+# réutilisés pour chaque cellule (openpyxl déduplique les styles par égalité,
+# mais réutiliser la même instance évite l'allocation et le hash à chaque cellule)
+_COULEUR_MATIN = PatternFill(start_color="FFFFFFCC", end_color="FFFFFFCC", fill_type="solid")
+_COULEUR_APRES_MIDI = PatternFill(start_color="FFFFCCFF", end_color="FFFFCCFF", fill_type="solid")
+_COULEUR_NUIT = PatternFill(start_color="FFCCCCFF", end_color="FFCCCCFF", fill_type="solid")
+_COULEUR_VIDE = PatternFill(start_color="FFF9F9F9", end_color="FFF9F9F9", fill_type="solid")
+_COULEUR_HEADER = PatternFill(start_color="FFCCCCCC", end_color="FFCCCCCC", fill_type="solid")
+_COULEUR_HEADER_JOUR = PatternFill(start_color="FFE6E6E6", end_color="FFE6E6E6", fill_type="solid")
+_COULEUR_OK = PatternFill(start_color="FFCCFFCC", end_color="FFCCFFCC", fill_type="solid")
+_COULEUR_PROBLEME = PatternFill(start_color="FFFFCCCC", end_color="FFFFCCCC", fill_type="solid")
+# Une couleur de fond par rôle, partagée par les feuilles Planning et Analyse
+_COULEURS_ROLES = {
+    'superviseur': PatternFill(start_color="FFFFE6CC", end_color="FFFFE6CC", fill_type="solid"),
+    'receptionniste': PatternFill(start_color="FFE6F3FF", end_color="FFE6F3FF", fill_type="solid"),
+    'concierge': PatternFill(start_color="FFE6FFE6", end_color="FFE6FFE6", fill_type="solid"),
+}
+_FONT_GRAS = Font(bold=True)
+_FONT_TITRE = Font(bold=True, size=14)
+_FONT_SECTION = Font(bold=True, size=12)
+_FONT_ITALIQUE = Font(italic=True)
+_FONT_SHIFT = Font(bold=True, size=10)
+_CENTRE = Alignment(horizontal='center')
+_RETOUR_LIGNE = Alignment(wrap_text=True, vertical='top')
+
+# En-têtes et largeurs de colonnes des feuilles d'export (constantes : pas de
+# reconstruction de listes à chaque téléchargement)
+_ENTETES_VALIDATION = ('Jour', 'Shift', 'Total', 'Superviseurs', 'Réceptionnistes', 'Concierge', 'Statut', 'Détails')
+_ENTETES_ANALYSE = ('Employé', 'Rôle', 'Contrat', 'Jours Travaillés', 'Jours Contractuels', 'Heures', 'Conforme')
+_LARGEURS_VALIDATION = (12, 12, 8, 12, 15, 10, 10, 40)
+
+
+def _cellule(ws, valeur, fill=None, font=None, alignement=None):
+    """Construit une cellule stylée pour une feuille en mode write-only"""
+    cellule = WriteOnlyCell(ws, value=valeur)
+    if fill is not None:
+        cellule.fill = fill
+    if font is not None:
+        cellule.font = font
+    if alignement is not None:
+        cellule.alignment = alignement
+    return cellule
+
+
+def _solveur_par_defaut(warm_start=False):
+    """Retourne le solveur à utiliser, ou None pour le CBC par défaut de PuLP.
+
+    Le choix peut être forcé via la variable d'environnement PLANNING_SOLVER
+    (``cbc``, ``highs`` ou ``gurobi``) pour comparer les déploiements. Sans
+    consigne, on prend HiGHS s'il est installé (nettement plus rapide que CBC
+    sur ce type de petit programme binaire), sinon CBC. Avec ``warm_start``,
+    le solveur est configuré pour repartir des valeurs initiales des variables.
+    """
+    from pulp import HiGHS_CMD
+
+    choix = os.environ.get('PLANNING_SOLVER', '').lower()
+    if choix == 'gurobi':
+        try:
+            from pulp import GUROBI_CMD
+            solveur = GUROBI_CMD(msg=False, threads=os.cpu_count(),
+                                 options=[('ConcurrentMIP', '4')])
+            if solveur.available():
+                return solveur
+        except Exception:
+            pass
+    if choix != 'cbc':
+        try:
+            solveur = HiGHS_CMD(msg=False, timeLimit=30, threads=os.cpu_count(),
+                                warmStart=warm_start)
+            if solveur.available():
+                return solveur
+        except Exception:
+            pass
+    if warm_start:
+        try:
+            from pulp import PULP_CBC_CMD
+            return PULP_CBC_CMD(msg=False, warmStart=True)
+        except Exception:
+            pass
+    return None
 
 # ================================
 # SYSTEME DE PLANNING
 # ================================
 
 class HotelPlanningSystem:
-    def __init__(self):
+    # Tuple partagé : évite de réallouer la liste des shifts à chaque boucle
+    SHIFTS = ('matin', 'apres_midi', 'nuit')
+    WEEKEND = frozenset(('Samedi', 'Dimanche'))
+
+    def __init__(self, solver=None):
         self.employees = []
+        self.solver = solver  # Solveur PuLP imposé ; None = choix automatique
+        self._derniere_solution = None  # Affectation du dernier solve, pour le démarrage à chaud
+        self._partitions = None  # Partitions par rôle en cache, voir _partitions_roles
+        self._index_noms = {}  # (prenom, nom) -> position dans self.employees
+        self._prenoms = set()  # Prénoms en service : clés des variables du solveur, doivent être uniques
         self.hotel_capacity = 422
         self.clients_per_receptionist = 50
         self.max_receptionists_per_shift = 4
@@ -67,53 +191,168 @@ class HotelPlanningSystem:
         self.nb_night_receptionists_total = 3
         self.nb_night_receptionists_required = 2
         self.nb_concierges = 1
-        self.jours_semaine = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
+        self.jours_semaine = list(_JOURS)
 
     def ajouter_employe(self, employee: Employee):
+        """Ajoute un employé en garantissant l'unicité du prénom.
+
+        Les variables du solveur sont indexées par prénom : deux homonymes
+        fusionneraient silencieusement leurs affectations.
+        """
+        if len(self._prenoms) != len(self.employees):
+            # La liste a été modifiée directement (clear, renommage) : resynchroniser
+            self._reconstruire_index()
+        if employee.prenom in self._prenoms:
+            raise ValueError(f"Un employé prénommé {employee.prenom} existe déjà - "
+                             "utilisez un prénom distinct (ex: avec initiale)")
+        self._prenoms.add(employee.prenom)
+        self._index_noms[(employee.prenom, employee.nom)] = len(self.employees)
         self.employees.append(employee)
+        self._partitions = None
+
+    def ajouter_employes(self, employees):
+        """Ajoute plusieurs employés d'un coup (validation puis extend unique)"""
+        nouveaux = list(employees)
+        if len(self._prenoms) != len(self.employees):
+            self._reconstruire_index()
+        prenoms_vus = set(self._prenoms)
+        for employee in nouveaux:
+            if employee.prenom in prenoms_vus:
+                raise ValueError(f"Un employé prénommé {employee.prenom} existe déjà - "
+                                 "utilisez un prénom distinct (ex: avec initiale)")
+            prenoms_vus.add(employee.prenom)
+        base = len(self.employees)
+        self.employees.extend(nouveaux)
+        self._prenoms = prenoms_vus
+        for i, employee in enumerate(nouveaux):
+            self._index_noms[(employee.prenom, employee.nom)] = base + i
+        self._partitions = None
+
+    def _reconstruire_index(self):
+        self._index_noms = {(e.prenom, e.nom): i for i, e in enumerate(self.employees)}
+        self._prenoms = {e.prenom for e in self.employees}
+
+    def renommer_employe(self, idx: int, nouveau_prenom: str, nouveau_nom: str):
+        """Renomme un employé en garantissant l'unicité du prénom.
+
+        Même règle qu'à l'ajout : les variables du solveur sont indexées par
+        prénom, renommer vers un prénom déjà pris fusionnerait silencieusement
+        les affectations de deux employés.
+        """
+        employe = self.employees[idx]
+        cle = (employe.prenom, employe.nom)
+        if len(self._index_noms) != len(self.employees) or cle not in self._index_noms:
+            self._reconstruire_index()
+        if nouveau_prenom != employe.prenom and nouveau_prenom in self._prenoms:
+            raise ValueError(f"Un employé prénommé {nouveau_prenom} existe déjà - "
+                             "utilisez un prénom distinct (ex: avec initiale)")
+        self._prenoms.discard(employe.prenom)
+        self._index_noms.pop(cle, None)
+        employe.prenom = nouveau_prenom
+        employe.nom = nouveau_nom
+        self._prenoms.add(nouveau_prenom)
+        self._index_noms[(nouveau_prenom, nouveau_nom)] = idx
 
     def supprimer_employe(self, prenom, nom):
-        self.employees = [e for e in self.employees if not (e.prenom == prenom and e.nom == nom)]
+        """Supprime un employé en O(1) par échange avec le dernier de la liste.
+
+        L'index est reconstruit à la demande si la liste ou les noms ont été
+        modifiés directement par l'interface (clear, renommage).
+        """
+        cle = (prenom, nom)
+        if len(self._index_noms) != len(self.employees) or cle not in self._index_noms:
+            self._reconstruire_index()
+        idx = self._index_noms.pop(cle, None)
+        if idx is None:
+            return
+        dernier = self.employees.pop()
+        if idx < len(self.employees):
+            self.employees[idx] = dernier
+            self._index_noms[(dernier.prenom, dernier.nom)] = idx
+        self._prenoms.discard(prenom)
+        self._partitions = None
+
+    def _partitions_roles(self):
+        """Partitions de l'équipe par rôle, mises en cache entre deux solves.
+
+        Invalidé par ajouter/supprimer_employe et par un changement de taille
+        (l'interface vide parfois la liste directement). La disponibilité est
+        modifiée en place par l'interface, elle est donc filtrée au moment de
+        l'appel et jamais mise en cache ; le rôle et le type de contrat, eux,
+        sont immuables après création.
+        """
+        if self._partitions is None or self._partitions[0] != len(self.employees):
+            superviseurs, recep_jour, recep_nuit, concierges = [], [], [], []
+            for e in self.employees:
+                role = e.role
+                if role == 'superviseur':
+                    superviseurs.append(e)
+                elif role == 'receptionniste':
+                    (recep_nuit if e.type_contrat == 'nuit' else recep_jour).append(e)
+                elif role == 'concierge':
+                    concierges.append(e)
+            self._partitions = (len(self.employees), superviseurs, recep_jour, recep_nuit, concierges)
+        return self._partitions[1:]
+
+    def _tableau_employes(self) -> np.ndarray:
+        """Vue en colonnes (SoA) de l'équipe pour les calculs vectorisés NumPy"""
+        # Dtypes serrés : les compteurs de jours tiennent sur un octet et la
+        # disponibilité est un booléen, ce qui garde la ligne compacte en cache
+        table = np.zeros(len(self.employees), dtype=[
+            ('role', 'U16'),
+            ('type_contrat', 'U16'),
+            ('disponible', 'bool'),
+            ('jours_absence', 'i1'),
+            ('jours_semaine', 'i1'),
+            ('jours_travail_max', 'i1'),
+        ])
+        for i, emp in enumerate(self.employees):
+            table[i] = (emp.role, emp.type_contrat, emp.disponible,
+                        emp.jours_absence, emp.jours_semaine, emp.jours_travail_max_semaine)
+        return table
 
     def calculer_besoins_personnel(self, checkins: Dict[str, int], checkouts: Dict[str, int]) -> Dict:
         besoins = {}
-        for jour in self.jours_semaine:
-            nb_checkins = checkins.get(jour, 0)
-            nb_checkouts = checkouts.get(jour, 0)
-
-            # Calcul des besoins totaux en personnel (superviseurs + réceptionnistes)
-            besoin_total_matin = max(1, int(np.ceil(nb_checkouts / self.clients_per_receptionist)))
-            besoin_total_apres_midi = max(1, int(np.ceil(nb_checkins / self.clients_per_receptionist)))
-
-            # Maximum 4 personnes par shift (incluant concierge si présent)
-            max_personnel_disponible = self.max_receptionists_per_shift
-            if jour not in ['Samedi', 'Dimanche']:
-                max_personnel_disponible -= 1  # -1 pour le concierge en semaine
-
-            besoin_total_matin = min(besoin_total_matin, max_personnel_disponible)
-            besoin_total_apres_midi = min(besoin_total_apres_midi, max_personnel_disponible)
-
-            # Ajustement selon l'occupation - si faible, on peut réduire les besoins
-            total_activite = nb_checkins + nb_checkouts
-            if total_activite < 100:  # Occupation faible
-                besoin_total_matin = max(1, besoin_total_matin - 1)
-                besoin_total_apres_midi = max(1, besoin_total_apres_midi - 1)
-
+        table = self._tableau_employes()
+        nb_nuit_dispo = int(np.count_nonzero(
+            (table['role'] == 'receptionniste')
+            & (table['type_contrat'] == 'nuit')
+            & table['disponible']
+        ))
+        # Calcul vectorisé sur les 7 jours d'un coup plutôt qu'en boucle Python
+        ci = np.fromiter((checkins.get(j, 0) for j in self.jours_semaine), dtype=np.int32, count=7)
+        co = np.fromiter((checkouts.get(j, 0) for j in self.jours_semaine), dtype=np.int32, count=7)
+
+        # Maximum 4 personnes par shift, -1 pour le concierge en semaine
+        max_personnel = np.full(7, self.max_receptionists_per_shift, dtype=np.int32)
+        max_personnel[:5] -= 1
+        concierge_matin = np.array([1, 1, 1, 1, 1, 0, 0], dtype=np.int32)
+
+        # Besoins totaux en personnel (superviseurs + réceptionnistes) :
+        # plafond de division entière, borné entre 1 et le maximum du shift
+        besoin_matin = np.minimum(-(-co // self.clients_per_receptionist), max_personnel).clip(min=1)
+        besoin_apres_midi = np.minimum(-(-ci // self.clients_per_receptionist), max_personnel).clip(min=1)
+
+        # Ajustement selon l'occupation - si faible, on peut réduire les besoins
+        occupation_faible = (ci + co) < 100
+        besoin_matin = np.where(occupation_faible, np.maximum(1, besoin_matin - 1), besoin_matin)
+        besoin_apres_midi = np.where(occupation_faible, np.maximum(1, besoin_apres_midi - 1), besoin_apres_midi)
+
+        nb_nuit_requis = min(self.nb_night_receptionists_required, nb_nuit_dispo)
+        for i, jour in enumerate(self.jours_semaine):
             besoins[jour] = {
                 'matin': {
-                    'total_personnel': besoin_total_matin,  # Total superviseurs + réceptionnistes
+                    'total_personnel': int(besoin_matin[i]),  # Total superviseurs + réceptionnistes
                     'min_superviseurs': 1,  # Au moins 1 superviseur obligatoire
-                    'concierge': 1 if jour not in ['Samedi', 'Dimanche'] else 0
+                    'concierge': int(concierge_matin[i])
                 },
                 'apres_midi': {
-                    'total_personnel': besoin_total_apres_midi,
+                    'total_personnel': int(besoin_apres_midi[i]),
                     'min_superviseurs': 1,  # Au moins 1 superviseur obligatoire
                     'concierge': 0  # Concierge uniquement le matin
                 },
                 'nuit': {
-                    'receptionists': min(self.nb_night_receptionists_required, 
-                                       len([e for e in self.employees if e.role == 'receptionniste' 
-                                           and e.type_contrat == 'nuit' and e.disponible])),
+                    'receptionists': nb_nuit_requis,
                     'superviseurs': 0,
                     'concierge': 0
                 }
@@ -125,33 +364,42 @@ class HotelPlanningSystem:
         return [emp for emp in self.employees if emp.disponible]
 
     def verifier_faisabilite_planning(self, besoins: Dict) -> Dict:
-        """Vérifie si le planning est réalisable avec l'équipe disponible"""
-        employes_disponibles = self.get_employees_disponibles()
-        superviseurs_dispo = [e for e in employes_disponibles if e.role == 'superviseur']
-        receptionnistes_jour_dispo = [e for e in employes_disponibles if e.role == 'receptionniste' and e.type_contrat != 'nuit']
-        receptionnistes_nuit_dispo = [e for e in employes_disponibles if e.role == 'receptionniste' and e.type_contrat == 'nuit']
-        concierges_dispo = [e for e in employes_disponibles if e.role == 'concierge']
+        """Vérifie si le planning est réalisable avec l'équipe disponible.
+
+        Les comptages se font en une passe vectorisée sur la vue SoA de
+        l'équipe plutôt qu'avec une comprehension Python par catégorie.
+        """
+        table = self._tableau_employes()
+        dispo = table['disponible']
+        est_receptionniste = table['role'] == 'receptionniste'
+        est_nuit = table['type_contrat'] == 'nuit'
+
+        nb_disponibles = int(np.count_nonzero(dispo))
+        nb_superviseurs = int(np.count_nonzero(dispo & (table['role'] == 'superviseur')))
+        nb_recep_jour = int(np.count_nonzero(dispo & est_receptionniste & ~est_nuit))
+        nb_recep_nuit = int(np.count_nonzero(dispo & est_receptionniste & est_nuit))
+        nb_concierges = int(np.count_nonzero(dispo & (table['role'] == 'concierge')))
 
         problemes = []
         recommandations = []
 
         # Vérifications critiques
-        if len(superviseurs_dispo) < 1:
+        if nb_superviseurs < 1:
             problemes.append("❌ CRITIQUE: Aucun superviseur disponible")
-        elif len(superviseurs_dispo) < 2:
+        elif nb_superviseurs < 2:
             recommandations.append("⚠️ Un seul superviseur disponible - couverture limitée")
 
-        if len(receptionnistes_nuit_dispo) < 2:
-            if len(receptionnistes_nuit_dispo) == 0:
+        if nb_recep_nuit < 2:
+            if nb_recep_nuit == 0:
                 problemes.append("❌ CRITIQUE: Aucun réceptionniste de nuit disponible")
             else:
                 problemes.append("❌ CRITIQUE: Un seul réceptionniste de nuit disponible (2 requis)")
 
-        if len(concierges_dispo) == 0:
+        if nb_concierges == 0:
             recommandations.append("⚠️ Concierge indisponible - service limité en semaine")
 
         # Calcul de la charge de travail
-        total_personnel_jour = len(superviseurs_dispo) + len(receptionnistes_jour_dispo)
+        total_personnel_jour = nb_superviseurs + nb_recep_jour
         if total_personnel_jour < 3:
             problemes.append("❌ Personnel jour insuffisant (minimum 3 pour couvrir les shifts)")
 
@@ -160,147 +408,237 @@ class HotelPlanningSystem:
             'problemes': problemes,
             'recommandations': recommandations,
             'stats': {
-                'total_disponibles': len(employes_disponibles),
-                'superviseurs': len(superviseurs_dispo),
-                'receptionnistes_jour': len(receptionnistes_jour_dispo),
-                'receptionnistes_nuit': len(receptionnistes_nuit_dispo),
-                'concierges': len(concierges_dispo)
+                'total_disponibles': nb_disponibles,
+                'superviseurs': nb_superviseurs,
+                'receptionnistes_jour': nb_recep_jour,
+                'receptionnistes_nuit': nb_recep_nuit,
+                'concierges': nb_concierges
             }
         }
 
     def generer_planning_optimise(self, checkins: Dict[str, int], checkouts: Dict[str, int], semaine_debut: datetime) -> Dict:
+        # Import différé : PuLP n'est chargé qu'au moment de résoudre,
+        # pas au démarrage de l'application
+        from pulp import LpProblem, LpMinimize, LpVariable, LpAffineExpression, LpStatus
+
         besoins = self.calculer_besoins_personnel(checkins, checkouts)
+
+        # Inutile de payer le démarrage du solveur si l'équipe rend le
+        # planning impossible : échec immédiat avec le diagnostic
+        faisabilite = self.verifier_faisabilite_planning(besoins)
+        if not faisabilite['faisable']:
+            for probleme in faisabilite['problemes']:
+                st.error(probleme)
+            return None
+
         prob = LpProblem("Planning_Front_Office", LpMinimize)
 
-        # Variables décision
-        x = {}
-        for emp in self.employees:
-            x[emp.prenom] = {}
-            for jour in self.jours_semaine:
-                x[emp.prenom][jour] = {}
-                for shift in ['matin', 'apres_midi', 'nuit']:
-                    x[emp.prenom][jour][shift] = LpVariable(f"x_{emp.prenom}_{jour}_{shift}", cat='Binary')
-
-        # Fonction objectif : minimiser le nombre total d'affectations
-        prob += lpSum([
-            x[emp.prenom][jour][shift]
-            for emp in self.employees
-            for jour in self.jours_semaine
-            for shift in ['matin', 'apres_midi', 'nuit']
-        ])
+        # Variables décision : dictionnaire plat indexé (prenom, jour, shift).
+        # Les noms courts x0..x314 évitent de formater et hacher un libellé
+        # composite par variable ; la clé du dict garde toute la sémantique.
+        x = {
+            cle: LpVariable(f"x{i}", cat='Binary')
+            for i, cle in enumerate(
+                (emp.prenom, jour, shift)
+                for emp in self.employees
+                for jour in self.jours_semaine
+                for shift in self.SHIFTS
+            )
+        }
+
+        # Fonction objectif : minimiser le nombre total d'affectations.
+        # LpAffineExpression consomme directement les paires (variable, coeff)
+        # sans liste intermédiaire ni additions terme à terme comme lpSum.
+        prob += LpAffineExpression((variable, 1) for variable in x.values())
 
         # Ajouter toutes les contraintes
         self._ajouter_contraintes(prob, x, besoins)
-        
-        # Résoudre
-        prob.solve()
+
+        # Démarrage à chaud : repartir de la dernière affectation connue évite
+        # de réexplorer tout l'arbre de branch-and-bound quand l'occupation ne
+        # change qu'à la marge entre deux générations
+        warm_start = self._derniere_solution is not None
+        if warm_start:
+            for cle, variable in x.items():
+                # Les cases figées à 0 (indisponibilité...) priment sur la
+                # solution précédente
+                valeur = self._derniere_solution.get(cle, 0) if variable.upBound != 0 else 0
+                variable.setInitialValue(valeur)
+
+        # Résoudre (solveur imposé, sinon HiGHS si disponible, sinon CBC)
+        solveur = self.solver if self.solver is not None else _solveur_par_defaut(warm_start)
+        if solveur is not None:
+            prob.solve(solveur)
+        else:
+            prob.solve()
 
         if prob.status != 1:
             st.warning(f"⚠️ Statut du solveur : {LpStatus[prob.status]}. Solution approchée proposée.")
 
-        return self._extraire_planning(x)
+        planning = self._extraire_planning(x)
+        self._derniere_solution = {
+            (e['prenom'], jour, shift): 1
+            for jour, par_shift in planning.items()
+            for shift, equipe in par_shift.items()
+            for e in equipe
+        }
+        return planning
 
     def _ajouter_contraintes(self, prob, x, besoins):
-        # Listes des employés par type - SEULEMENT LES DISPONIBLES
-        employes_disponibles = self.get_employees_disponibles()
-        superviseurs = [e for e in employes_disponibles if e.role == 'superviseur']
-        receptionnistes_jour = [e for e in employes_disponibles if e.role == 'receptionniste' and e.type_contrat != 'nuit']
-        receptionnistes_nuit = [e for e in employes_disponibles if e.role == 'receptionniste' and e.type_contrat == 'nuit']
-        concierges = [e for e in employes_disponibles if e.role == 'concierge']
+        from pulp import LpAffineExpression, LpConstraint, LpConstraintEQ, LpConstraintGE, LpConstraintLE
 
-        # Contrainte : les employés indisponibles ne peuvent pas être assignés
+        def contrainte(variables, sens, borne):
+            # Construit la contrainte directement : LpAffineExpression consomme
+            # les paires (var, 1) et LpConstraint évite la copie d'expression
+            # qu'impliquent les opérateurs >=/<=/== de PuLP
+            prob.addConstraint(LpConstraint(LpAffineExpression((v, 1) for v in variables), sens, rhs=borne))
+
+        # Listes des employés par type - SEULEMENT LES DISPONIBLES.
+        # Les partitions par rôle viennent du cache ; seule la disponibilité,
+        # mutable, est filtrée ici.
+        employes_disponibles = self.get_employees_disponibles()
+        tous_superviseurs, tous_recep_jour, tous_recep_nuit, tous_concierges = self._partitions_roles()
+        superviseurs = [e for e in tous_superviseurs if e.disponible]
+        receptionnistes_jour = [e for e in tous_recep_jour if e.disponible]
+        receptionnistes_nuit = [e for e in tous_recep_nuit if e.disponible]
+        concierges = [e for e in tous_concierges if e.disponible]
+
+        # Partitions dérivées, construites une seule fois plutôt qu'à chaque
+        # itération (jour, shift) ; le test d'exclusion nuit se fait par identité
+        nuit_ids = frozenset(id(e) for e in receptionnistes_nuit)
+        autres_que_nuit = [e for e in employes_disponibles if id(e) not in nuit_ids]
+        personnel_jour_disponible = superviseurs + receptionnistes_jour
+        tous_employes_jour = personnel_jour_disponible + concierges
+
+        # Contrainte : les employés indisponibles ne peuvent pas être assignés.
+        # Figer la borne supérieure à 0 retire ces cases du modèle sans créer
+        # 21 lignes de contraintes par absent
         for emp in self.employees:
             if not emp.disponible:
                 for jour in self.jours_semaine:
-                    for shift in ['matin', 'apres_midi', 'nuit']:
-                        prob += x[emp.prenom][jour][shift] == 0
+                    for shift in self.SHIFTS:
+                        x[emp.prenom, jour, shift].upBound = 0
 
         # Contraintes de couverture par shift
         for jour in self.jours_semaine:
-            for shift in ['matin', 'apres_midi', 'nuit']:
+            for shift in self.SHIFTS:
                 if shift == 'nuit':
                     # Réceptionnistes de nuit selon disponibilité
                     nb_requis = min(besoins[jour][shift]['receptionists'], len(receptionnistes_nuit))
                     if nb_requis > 0:
-                        prob += lpSum([x[e.prenom][jour][shift] for e in receptionnistes_nuit]) == nb_requis
-                    
+                        contrainte((x[e.prenom, jour, shift] for e in receptionnistes_nuit),
+                                   LpConstraintEQ, nb_requis)
+
                     # Aucun autre type d'employé la nuit
-                    autres = [e for e in employes_disponibles if e not in receptionnistes_nuit]
-                    for emp in autres:
-                        prob += x[emp.prenom][jour][shift] == 0
+                    for emp in autres_que_nuit:
+                        x[emp.prenom, jour, shift].upBound = 0
                 else:
                     # Shifts jour : au moins 1 superviseur si disponible
                     if len(superviseurs) > 0:
-                        prob += lpSum([x[s.prenom][jour][shift] for s in superviseurs]) >= 1
+                        contrainte((x[s.prenom, jour, shift] for s in superviseurs),
+                                   LpConstraintGE, 1)
 
                     # Nombre total de personnel selon les besoins et disponibilité
                     nb_besoin = besoins[jour][shift]['total_personnel']
-                    personnel_jour_disponible = superviseurs + receptionnistes_jour
                     nb_possible = min(nb_besoin, len(personnel_jour_disponible))
-                    
+
                     if nb_possible > 0:
-                        prob += (
-                            lpSum([x[e.prenom][jour][shift] for e in receptionnistes_jour]) +
-                            lpSum([x[s.prenom][jour][shift] for s in superviseurs])
-                        ) >= nb_possible
+                        contrainte((x[e.prenom, jour, shift] for e in personnel_jour_disponible),
+                                   LpConstraintGE, nb_possible)
 
                     # Concierge : selon disponibilité
-                    if jour not in ['Samedi', 'Dimanche'] and shift == 'matin' and len(concierges) > 0:
-                        prob += lpSum([x[c.prenom][jour][shift] for c in concierges]) == 1
+                    if jour not in self.WEEKEND and shift == 'matin' and len(concierges) > 0:
+                        contrainte((x[c.prenom, jour, shift] for c in concierges),
+                                   LpConstraintEQ, 1)
                     else:
                         for c in concierges:
-                            prob += x[c.prenom][jour][shift] == 0
+                            x[c.prenom, jour, shift].upBound = 0
 
                     # Maximum 4 personnes par shift
-                    tous_employes_jour = personnel_jour_disponible + concierges
                     if len(tous_employes_jour) > 0:
-                        prob += lpSum([x[e.prenom][jour][shift] for e in tous_employes_jour]) <= self.max_receptionists_per_shift
+                        contrainte((x[e.prenom, jour, shift] for e in tous_employes_jour),
+                                   LpConstraintLE, self.max_receptionists_per_shift)
 
         # Contraintes par employé - SEULEMENT LES DISPONIBLES
         for emp in employes_disponibles:
+            # Total de shifts par jour, construit une fois et réutilisé par les
+            # trois familles de contraintes (journalière, hebdomadaire, glissante)
+            total_jour = {
+                jour: LpAffineExpression((x[emp.prenom, jour, shift], 1) for shift in self.SHIFTS)
+                for jour in self.jours_semaine
+            }
+
             # Un seul shift par jour maximum
-            for jour in self.jours_semaine:
-                prob += lpSum([x[emp.prenom][jour][shift] for shift in ['matin', 'apres_midi', 'nuit']]) <= 1
+            for expression in total_jour.values():
+                prob.addConstraint(LpConstraint(expression, LpConstraintLE, rhs=1))
 
             # Respect du nombre de jours de travail disponibles (contractuels - absences)
-            jours_max_cette_semaine = emp.jours_travail_max_semaine
-            prob += lpSum([
-                lpSum([x[emp.prenom][jour][shift] for shift in ['matin', 'apres_midi', 'nuit']])
-                for jour in self.jours_semaine
-            ]) <= jours_max_cette_semaine
-
-            # Contrainte : maximum 5 jours consécutifs de travail
+            semaine = LpAffineExpression()
+            for expression in total_jour.values():
+                semaine.addInPlace(expression)
+            prob.addConstraint(LpConstraint(semaine, LpConstraintLE, rhs=emp.jours_travail_max_semaine))
+
+            # Contrainte : maximum 5 jours consécutifs de travail. La semaine
+            # n'est pas cyclique : les deux fenêtres de 6 jours [Lun..Sam] et
+            # [Mar..Dim] couvrent toutes les séquences possibles.
             for i in range(len(self.jours_semaine) - 5):
-                jours_seq = self.jours_semaine[i:i+6]
-                prob += lpSum([
-                    lpSum([x[emp.prenom][j][shift] for shift in ['matin', 'apres_midi', 'nuit']])  
-                    for j in jours_seq
-                ]) <= 5
+                fenetre = LpAffineExpression()
+                for j in self.jours_semaine[i:i + 6]:
+                    fenetre.addInPlace(total_jour[j])
+                prob.addConstraint(LpConstraint(fenetre, LpConstraintLE, rhs=5))
 
             # Contraintes spécifiques par rôle
             if emp.role == 'concierge':
                 # Concierge uniquement le matin en semaine
                 for jour in self.jours_semaine:
-                    prob += x[emp.prenom][jour]['nuit'] == 0
-                    prob += x[emp.prenom][jour]['apres_midi'] == 0
-                    if jour in ['Samedi', 'Dimanche']:
-                        prob += x[emp.prenom][jour]['matin'] == 0
+                    x[emp.prenom, jour, 'nuit'].upBound = 0
+                    x[emp.prenom, jour, 'apres_midi'].upBound = 0
+                    if jour in self.WEEKEND:
+                        x[emp.prenom, jour, 'matin'].upBound = 0
 
     def _extraire_planning(self, x) -> Dict:
-        planning = {}
-        for jour in self.jours_semaine:
-            planning[jour] = {'matin': [], 'apres_midi': [], 'nuit': []}
-            for emp in self.employees:
-                for shift in ['matin', 'apres_midi', 'nuit']:
-                    if x[emp.prenom][jour][shift].varValue == 1:
-                        planning[jour][shift].append({
-                            'prenom': emp.prenom,
-                            'nom': emp.nom,
-                            'role': emp.role,
-                            'type_contrat': emp.type_contrat
-                        })
+        # Une seule passe sur le dict plat des variables : chaque employé est
+        # sérialisé une fois en amont, la boucle chaude n'alloue plus rien
+        fiche_par_prenom = {
+            emp.prenom: {
+                'prenom': emp.prenom,
+                'nom': emp.nom,
+                'role': emp.role,
+                'type_contrat': emp.type_contrat
+            }
+            for emp in self.employees
+        }
+        planning = {jour: {'matin': [], 'apres_midi': [], 'nuit': []}
+                    for jour in self.jours_semaine}
+        for (prenom, jour, shift), variable in x.items():
+            if variable.varValue == 1:
+                planning[jour][shift].append(fiche_par_prenom[prenom])
         return planning
-    
+
+    def _comptes_roles_par_shift(self, planning: Dict) -> Dict:
+        """Comptes de rôles par (jour, shift) : un Counter par équipe, en une passe.
+
+        Partagé entre la vérification des violations et la feuille de
+        validation de l'export, qui recomptaient chacun trois fois par shift.
+        """
+        return {
+            (jour, shift): Counter(e['role'] for e in planning[jour][shift])
+            for jour in self.jours_semaine
+            for shift in self.SHIFTS
+        }
+
+    def _index_presences(self, planning: Dict) -> Dict:
+        """Index inversé du planning : idx[jour][shift] = frozenset des prénoms affectés.
+
+        Remplace les scans ``any(e['prenom'] == ...)`` répétés sur les listes
+        du planning par un test d'appartenance O(1).
+        """
+        return {
+            jour: {shift: frozenset(e['prenom'] for e in planning[jour][shift])
+                   for shift in self.SHIFTS}
+            for jour in self.jours_semaine
+        }
+
     def analyser_planning(self, planning: Dict) -> Dict:
         """Analyse complète du planning généré"""
         analyse = {
@@ -310,49 +648,53 @@ class HotelPlanningSystem:
             'statistiques_globales': {}
         }
 
-        # Heures et jours travaillés par employé
-        for emp in self.employees:
-            heures = 0
-            jours_travailles = 0
-            shifts_travailles = []
-            
-            for jour in self.jours_semaine:
-                jour_travaille = False
-                for shift in ['matin', 'apres_midi', 'nuit']:
-                    if any(e['prenom'] == emp.prenom for e in planning[jour][shift]):
-                        if shift == 'nuit':
-                            heures += 8  # 8h de nuit
-                        else:
-                            heures += 8  # 8h de jour
-                        jour_travaille = True
-                        shifts_travailles.append(f"{jour}_{shift}")
-                        
-                if jour_travaille:
-                    jours_travailles += 1
-                    
+        # Représentation SoA du planning : tenseur d'affectation (7, 3, E) en
+        # int8, rempli en une seule traversée des listes du planning. Tous les
+        # agrégats en découlent par réductions NumPy.
+        employes = self.employees
+        nb_emp = len(employes)
+        idx_emp = {emp.prenom: i for i, emp in enumerate(employes)}
+        affectations = np.zeros((7, 3, nb_emp), dtype=np.int8)
+        shifts_par_employe = [[] for _ in range(nb_emp)]
+        for d, jour in enumerate(self.jours_semaine):
+            for s, shift in enumerate(self.SHIFTS):
+                for e in planning[jour][shift]:
+                    i = idx_emp.get(e['prenom'])
+                    if i is not None:
+                        affectations[d, s, i] = 1
+                        shifts_par_employe[i].append(f"{jour}_{shift}")
+
+        # Heures et jours travaillés par employé (8h par shift, jour et nuit)
+        nb_shifts_emp = affectations.sum(axis=(0, 1))
+        jours_par_emp = affectations.any(axis=1).sum(axis=0)
+        for i, emp in enumerate(employes):
+            jours_travailles = int(jours_par_emp[i])
             analyse['heures_par_employe'][f"{emp.prenom} {emp.nom}"] = {
-                'heures': heures,
+                'heures': int(nb_shifts_emp[i]) * 8,
                 'jours_travailles': jours_travailles,
                 'jours_contractuels': emp.jours_semaine,
                 'respect_contrat': jours_travailles <= emp.jours_semaine,
                 'role': emp.role,
                 'type_contrat': emp.type_contrat,
-                'shifts': shifts_travailles
+                'shifts': shifts_par_employe[i]
             }
 
-        # Couverture par shift
-        for jour in self.jours_semaine:
-            for shift in ['matin', 'apres_midi', 'nuit']:
+        # Couverture par shift : comptes par rôle via un produit (21, E) x (E, 3)
+        roles = ('receptionniste', 'superviseur', 'concierge')
+        onehot_roles = np.zeros((nb_emp, 3), dtype=np.int8)
+        for i, emp in enumerate(employes):
+            if emp.role in roles:
+                onehot_roles[i, roles.index(emp.role)] = 1
+        comptes_roles = affectations.reshape(21, nb_emp) @ onehot_roles
+        for d, jour in enumerate(self.jours_semaine):
+            for s, shift in enumerate(self.SHIFTS):
+                k = d * 3 + s
                 equipe = planning[jour][shift]
-                nb_receptionists = len([e for e in equipe if e['role'] == 'receptionniste'])
-                nb_superviseurs = len([e for e in equipe if e['role'] == 'superviseur'])
-                nb_concierges = len([e for e in equipe if e['role'] == 'concierge'])
-                
-                analyse['couverture_par_shift'][f"{jour}_{shift}"] = {
+                analyse['couverture_par_shift'][(jour, shift)] = {
                     'total': len(equipe),
-                    'receptionnistes': nb_receptionists,
-                    'superviseurs': nb_superviseurs,
-                    'concierge': nb_concierges,
+                    'receptionnistes': int(comptes_roles[k, 0]),
+                    'superviseurs': int(comptes_roles[k, 1]),
+                    'concierge': int(comptes_roles[k, 2]),
                     'equipe': [f"{e['prenom']} {e['nom']} ({e['role']})" for e in equipe]
                 }
 
@@ -374,20 +716,20 @@ class HotelPlanningSystem:
     def _verifier_violations(self, planning: Dict) -> List[str]:
         violations = []
         
+        comptes = self._comptes_roles_par_shift(planning)
         for jour in self.jours_semaine:
             # Vérifications pour les shifts jour
             for shift in ['matin', 'apres_midi']:
-                equipe = planning[jour][shift]
-                nb_superviseurs = len([e for e in equipe if e['role'] == 'superviseur'])
-                nb_concierges = len([e for e in equipe if e['role'] == 'concierge'])
-                nb_receptionnistes = len([e for e in equipe if e['role'] == 'receptionniste'])
+                compteur = comptes[(jour, shift)]
+                nb_superviseurs = compteur['superviseur']
+                nb_concierges = compteur['concierge']
                 
                 # Au moins 1 superviseur obligatoire
                 if nb_superviseurs < 1:
                     violations.append(f"VIOLATION: {jour} {shift} - Doit avoir au moins 1 superviseur (trouvé: {nb_superviseurs})")
 
                 # Concierge en semaine le matin uniquement
-                if jour not in ['Samedi', 'Dimanche']:
+                if jour not in self.WEEKEND:
                     if shift == 'matin' and nb_concierges != 1:
                         violations.append(f"VIOLATION: {jour} {shift} - Concierge obligatoire en semaine le matin (trouvé: {nb_concierges})")
                     elif shift == 'apres_midi' and nb_concierges > 0:
@@ -397,7 +739,7 @@ class HotelPlanningSystem:
                         violations.append(f"VIOLATION: {jour} {shift} - Concierge interdit le weekend")
 
                 # Maximum 4 personnes par shift
-                total = len(equipe)
+                total = compteur.total()
                 if total > self.max_receptionists_per_shift:
                     violations.append(f"VIOLATION: {jour} {shift} - Maximum {self.max_receptionists_per_shift} personnes (trouvé: {total})")
 
@@ -406,10 +748,10 @@ class HotelPlanningSystem:
                     violations.append(f"VIOLATION: {jour} {shift} - Au moins 1 personne requise (trouvé: {total})")
 
             # Vérifications pour la nuit
-            equipe_nuit = planning[jour]['nuit']
-            nb_receptionists_nuit = len([e for e in equipe_nuit if e['role'] == 'receptionniste'])
-            nb_superviseurs_nuit = len([e for e in equipe_nuit if e['role'] == 'superviseur'])
-            nb_concierges_nuit = len([e for e in equipe_nuit if e['role'] == 'concierge'])
+            compteur_nuit = comptes[(jour, 'nuit')]
+            nb_receptionists_nuit = compteur_nuit['receptionniste']
+            nb_superviseurs_nuit = compteur_nuit['superviseur']
+            nb_concierges_nuit = compteur_nuit['concierge']
             
             if nb_receptionists_nuit != self.nb_night_receptionists_required:
                 violations.append(f"VIOLATION: {jour} nuit - Doit avoir exactement {self.nb_night_receptionists_required} réceptionnistes (trouvé: {nb_receptionists_nuit})")
@@ -420,188 +762,145 @@ class HotelPlanningSystem:
             if nb_concierges_nuit > 0:
                 violations.append(f"VIOLATION: {jour} nuit - Aucun concierge autorisé la nuit")
 
-        # Vérifications des contraintes employés
+        # Vérifications des contraintes employés : une seule traversée du
+        # planning construit le motif de présence de chacun (bit i = jour i),
+        # au lieu de re-scanner les 21 listes par employé
+        motif_par_prenom = {}
+        for i, jour in enumerate(self.jours_semaine):
+            bit = 1 << i
+            for shift in self.SHIFTS:
+                for e in planning[jour][shift]:
+                    motif_par_prenom[e['prenom']] = motif_par_prenom.get(e['prenom'], 0) | bit
+
         for emp in self.employees:
-            jours_travailles = 0
-            
-            for jour in self.jours_semaine:
-                travaille_ce_jour = False
-                for shift in ['matin', 'apres_midi', 'nuit']:
-                    if any(e['prenom'] == emp.prenom for e in planning[jour][shift]):
-                        travaille_ce_jour = True
-                        break
-                if travaille_ce_jour:
-                    jours_travailles += 1
+            motif_travail = motif_par_prenom.get(emp.prenom, 0)
+            jours_travailles = motif_travail.bit_count()
 
             # Vérification du respect du contrat
             if jours_travailles > emp.jours_semaine:
                 violations.append(f"VIOLATION: {emp.prenom} {emp.nom} - Travaille {jours_travailles} jours au lieu de {emp.jours_semaine} max")
 
+            # Jours de repos consécutifs si l'employé y a droit : le motif des
+            # jours off doit former un bloc contigu (test d'appartenance direct)
+            if emp.jours_off_consecutifs and jours_travailles:
+                motif_off = ~motif_travail & 0b1111111
+                if motif_off not in _MASQUES_OFF_CONSECUTIFS:
+                    violations.append(f"VIOLATION: {emp.prenom} {emp.nom} - Jours de repos non consécutifs")
+
         return violations
 
     def exporter_planning_excel(self, planning: Dict, analyse: Dict, semaine_debut: datetime) -> bytes:
-        """Exporte le planning au format Excel avec mise en forme"""
-        wb = Workbook()
-        
-        # Couleurs pour les rôles
-        couleurs_roles = {
-            'superviseur': PatternFill(start_color="FFE6CC", end_color="FFE6CC", fill_type="solid"),
-            'receptionniste': PatternFill(start_color="E6F3FF", end_color="E6F3FF", fill_type="solid"),
-            'concierge': PatternFill(start_color="E6FFE6", end_color="E6FFE6", fill_type="solid")
-        }
-        
+        """Exporte le planning au format Excel avec mise en forme.
+
+        Le classeur est construit en mode write-only d'openpyxl : chaque ligne
+        est streamée vers le XML au moment du append au lieu de matérialiser
+        toute la grille de cellules en mémoire, ce qui accélère la sauvegarde
+        et réduit fortement la consommation mémoire.
+        """
+        wb = Workbook(write_only=True)
+
         # Feuille 1: Planning Principal (Format Tableau avec sous-colonnes)
-        ws_planning = wb.active
-        ws_planning.title = "Planning Hebdomadaire"
-        
+        ws_planning = wb.create_sheet("Planning Hebdomadaire")
+
+        # Ajustement des largeurs de colonnes (avant l'écriture des lignes en mode write-only)
+        ws_planning.column_dimensions['A'].width = 18  # Employé
+        ws_planning.column_dimensions['B'].width = 12  # Rôle
+        ws_planning.column_dimensions['C'].width = 15  # Contrat
+
+        # Colonnes des shifts (plus petites car juste des icônes)
+        for i in range(21):  # 7 jours × 3 shifts = 21 colonnes, à partir de D
+            ws_planning.column_dimensions[get_column_letter(4 + i)].width = 5
+
         # En-têtes
-        ws_planning['A1'] = "PLANNING FRONT OFFICE"
-        ws_planning['A1'].font = Font(bold=True, size=14)
-        ws_planning['A2'] = f"Semaine du {semaine_debut.strftime('%d/%m/%Y')}"
-        ws_planning['A2'].font = Font(bold=True)
-        ws_planning['A3'] = "Équipe de 15 personnes : 5 superviseurs + 9 réceptionnistes + 1 concierge"
-        ws_planning['A3'].font = Font(italic=True)
-        
+        ws_planning.append([_cellule(ws_planning, "PLANNING FRONT OFFICE", font=_FONT_TITRE)])
+        ws_planning.append([_cellule(ws_planning, f"Semaine du {semaine_debut.strftime('%d/%m/%Y')}", font=_FONT_GRAS)])
+        ws_planning.append([_cellule(ws_planning, "Équipe de 15 personnes : 5 superviseurs + 9 réceptionnistes + 1 concierge", font=_FONT_ITALIQUE)])
+        ws_planning.append([])
+
         # Calcul des dates de la semaine
-        dates_semaine = []
-        for i in range(7):
-            date_jour = semaine_debut + timedelta(days=i)
-            dates_semaine.append(date_jour.strftime('%d/%m'))
-        
-        # Couleurs pour les shifts
-        couleur_matin = PatternFill(start_color="FFFFCC", end_color="FFFFCC", fill_type="solid")
-        couleur_apres_midi = PatternFill(start_color="FFCCFF", end_color="FFCCFF", fill_type="solid")
-        couleur_nuit = PatternFill(start_color="CCCCFF", end_color="CCCCFF", fill_type="solid")
-        couleur_vide = PatternFill(start_color="F9F9F9", end_color="F9F9F9", fill_type="solid")
-        couleur_header = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        couleur_header_jour = PatternFill(start_color="E6E6E6", end_color="E6E6E6", fill_type="solid")
-        
+        dates_semaine = _dates_semaine(semaine_debut)
+
         # Structure du tableau - En-têtes principales (ligne 5)
-        row = 5
-        ws_planning.cell(row=row, column=1, value="Employé").font = Font(bold=True)
-        ws_planning.cell(row=row, column=1).fill = couleur_header
-        ws_planning.cell(row=row, column=2, value="Rôle").font = Font(bold=True)
-        ws_planning.cell(row=row, column=2).fill = couleur_header
-        ws_planning.cell(row=row, column=3, value="Contrat").font = Font(bold=True)
-        ws_planning.cell(row=row, column=3).fill = couleur_header
-        
-        # En-têtes des jours avec dates (ligne 5)
+        ligne_entetes = [
+            _cellule(ws_planning, "Employé", fill=_COULEUR_HEADER, font=_FONT_GRAS),
+            _cellule(ws_planning, "Rôle", fill=_COULEUR_HEADER, font=_FONT_GRAS),
+            _cellule(ws_planning, "Contrat", fill=_COULEUR_HEADER, font=_FONT_GRAS),
+        ]
         col_start = 4
         for i, jour in enumerate(self.jours_semaine):
             date_str = dates_semaine[i]
             col = col_start + (i * 3)
-            
+
             # Fusionner 3 colonnes pour le nom du jour + date
-            ws_planning.merge_cells(start_row=row, start_column=col, end_row=row, end_column=col+2)
-            cell = ws_planning.cell(row=row, column=col, value=f"{jour} {date_str}")
-            cell.font = Font(bold=True)
-            cell.fill = couleur_header_jour
-            cell.alignment = Alignment(horizontal='center')
-        
+            ws_planning.merged_cells.add(f"{get_column_letter(col)}5:{get_column_letter(col + 2)}5")
+            ligne_entetes.append(_cellule(ws_planning, f"{jour} {date_str}",
+                                          fill=_COULEUR_HEADER_JOUR, font=_FONT_GRAS, alignement=_CENTRE))
+            ligne_entetes.append(_cellule(ws_planning, None, fill=_COULEUR_HEADER_JOUR))
+            ligne_entetes.append(_cellule(ws_planning, None, fill=_COULEUR_HEADER_JOUR))
+        ws_planning.append(ligne_entetes)
+
         # Sous-en-têtes des shifts (ligne 6)
-        row += 1
-        # Colonnes fixes
-        ws_planning.cell(row=row, column=1).fill = couleur_header
-        ws_planning.cell(row=row, column=2).fill = couleur_header
-        ws_planning.cell(row=row, column=3).fill = couleur_header
-        
+        ligne_shifts = [
+            _cellule(ws_planning, None, fill=_COULEUR_HEADER),
+            _cellule(ws_planning, None, fill=_COULEUR_HEADER),
+            _cellule(ws_planning, None, fill=_COULEUR_HEADER),
+        ]
         for i in range(7):  # 7 jours
-            col_base = col_start + (i * 3)
-            shifts = ["Matin", "AM", "Nuit"]
-            for j, shift in enumerate(shifts):
-                cell = ws_planning.cell(row=row, column=col_base + j, value=shift)
-                cell.font = Font(bold=True, size=10)
-                if shift == "Matin":
-                    cell.fill = couleur_matin
-                elif shift == "AM":
-                    cell.fill = couleur_apres_midi
-                else:
-                    cell.fill = couleur_nuit
-                cell.alignment = Alignment(horizontal='center')
-        
-        row += 1
-        
-        # Remplissage du planning par employé
+            for shift, couleur in (("Matin", _COULEUR_MATIN), ("AM", _COULEUR_APRES_MIDI), ("Nuit", _COULEUR_NUIT)):
+                ligne_shifts.append(_cellule(ws_planning, shift, fill=couleur,
+                                             font=_FONT_SHIFT, alignement=_CENTRE))
+        ws_planning.append(ligne_shifts)
+
+        # Remplissage du planning par employé : les 21 cellules de shifts sont
+        # produites par un seul générateur au lieu de trois blocs if/else par jour
+        presences = self._index_presences(planning)
+        icones_shifts = (
+            ('matin', "🌅", _COULEUR_MATIN),
+            ('apres_midi', "🌆", _COULEUR_APRES_MIDI),
+            ('nuit', "🌙", _COULEUR_NUIT),
+        )
         for emp in self.employees:
-            # Informations employé
-            ws_planning.cell(row=row, column=1, value=f"{emp.prenom} {emp.nom}")
-            ws_planning.cell(row=row, column=2, value=emp.role.title())
-            ws_planning.cell(row=row, column=3, value=emp.type_contrat.replace('_', ' ').title())
-            
-            # Coloration de la ligne selon le rôle
-            role_color = couleurs_roles.get(emp.role)
-            if role_color:
-                for col in range(1, 4):  # Colonnes employé, rôle, contrat
-                    ws_planning.cell(row=row, column=col).fill = role_color
-            
-            # Pour chaque jour, remplir les 3 shifts
-            for i, jour in enumerate(self.jours_semaine):
-                col_base = col_start + (i * 3)
-                
-                # Matin
-                if any(e['prenom'] == emp.prenom for e in planning[jour]['matin']):
-                    cell = ws_planning.cell(row=row, column=col_base, value="🌅")
-                    cell.fill = couleur_matin
-                    cell.font = Font(bold=True)
-                else:
-                    cell = ws_planning.cell(row=row, column=col_base, value="")
-                    cell.fill = couleur_vide
-                cell.alignment = Alignment(horizontal='center')
-                
-                # Après-midi
-                if any(e['prenom'] == emp.prenom for e in planning[jour]['apres_midi']):
-                    cell = ws_planning.cell(row=row, column=col_base + 1, value="🌆")
-                    cell.fill = couleur_apres_midi
-                    cell.font = Font(bold=True)
-                else:
-                    cell = ws_planning.cell(row=row, column=col_base + 1, value="")
-                    cell.fill = couleur_vide
-                cell.alignment = Alignment(horizontal='center')
-                
-                # Nuit
-                if any(e['prenom'] == emp.prenom for e in planning[jour]['nuit']):
-                    cell = ws_planning.cell(row=row, column=col_base + 2, value="🌙")
-                    cell.fill = couleur_nuit
-                    cell.font = Font(bold=True)
-                else:
-                    cell = ws_planning.cell(row=row, column=col_base + 2, value="")
-                    cell.fill = couleur_vide
-                cell.alignment = openpyxl.styles.Alignment(horizontal='center')
-            
-            row += 1
-        
-        # Ajustement des largeurs de colonnes
-        ws_planning.column_dimensions['A'].width = 18  # Employé
-        ws_planning.column_dimensions['B'].width = 12  # Rôle
-        ws_planning.column_dimensions['C'].width = 15  # Contrat
-        
-        # Colonnes des shifts (plus petites car juste des icônes)
-        for i in range(21):  # 7 jours × 3 shifts = 21 colonnes
-            col_letter = chr(68 + i)  # D, E, F, G, ...
-            ws_planning.column_dimensions[col_letter].width = 5
-        
+            # Informations employé, colorées selon le rôle
+            role_color = _COULEURS_ROLES.get(emp.role)
+            ligne = [
+                _cellule(ws_planning, f"{emp.prenom} {emp.nom}", fill=role_color),
+                _cellule(ws_planning, _libelle_role(emp.role), fill=role_color),
+                _cellule(ws_planning, _libelle_contrat(emp.type_contrat), fill=role_color),
+            ]
+            ligne.extend(
+                _cellule(ws_planning, icone, fill=couleur, font=_FONT_GRAS, alignement=_CENTRE)
+                if emp.prenom in presences[jour][shift]
+                else _cellule(ws_planning, "", fill=_COULEUR_VIDE, alignement=_CENTRE)
+                for jour in self.jours_semaine
+                for shift, icone, couleur in icones_shifts
+            )
+            ws_planning.append(ligne)
+
         # Feuille 2: Validation du Planning
-        ws_validation = wb.create_sheet("Validation", 1)
-        
+        ws_validation = wb.create_sheet("Validation")
+
+        # Ajustement des largeurs pour la validation
+        for i, width in enumerate(_LARGEURS_VALIDATION, 1):
+            ws_validation.column_dimensions[get_column_letter(i)].width = width
+
         # Titre
-        ws_validation['A1'] = "VALIDATION DU PLANNING"
-        ws_validation['A1'].font = Font(bold=True, size=12)
-        
-        # Création des données de validation avec dates
+        ws_validation.append([_cellule(ws_validation, "VALIDATION DU PLANNING", font=_FONT_SECTION)])
+        ws_validation.append([])
+
+        # Création des données de validation avec dates (statistiques comptées au fil de l'eau)
         validation_data = []
-        dates_semaine = []
-        for i in range(7):
-            date_jour = semaine_debut + timedelta(days=i)
-            dates_semaine.append(date_jour.strftime('%d/%m'))
-            
+        problemes_count = 0
+        total_shifts = 0
+
+        comptes = self._comptes_roles_par_shift(planning)
         for i, jour in enumerate(self.jours_semaine):
             date_str = dates_semaine[i]
-            for shift in ['matin', 'apres_midi', 'nuit']:
-                equipe = planning[jour][shift]
-                nb_superviseurs = len([e for e in equipe if e['role'] == 'superviseur'])
-                nb_receptionnistes = len([e for e in equipe if e['role'] == 'receptionniste'])
-                nb_concierges = len([e for e in equipe if e['role'] == 'concierge'])
-                total = len(equipe)
+            for shift in self.SHIFTS:
+                compteur = comptes[(jour, shift)]
+                nb_superviseurs = compteur['superviseur']
+                nb_receptionnistes = compteur['receptionniste']
+                nb_concierges = compteur['concierge']
+                total = compteur.total()
                 
                 # Validation des règles
                 validation_ok = True
@@ -624,16 +923,19 @@ class HotelPlanningSystem:
                     if total > 4:
                         validation_ok = False
                         problemes.append(f"Maximum 4 personnes (a {total})")
-                    if jour not in ['Samedi', 'Dimanche'] and shift == 'matin' and nb_concierges != 1:
+                    if jour not in self.WEEKEND and shift == 'matin' and nb_concierges != 1:
                         validation_ok = False
                         problemes.append(f"Concierge obligatoire en semaine le matin (a {nb_concierges})")
-                    if jour in ['Samedi', 'Dimanche'] and nb_concierges > 0:
+                    if jour in self.WEEKEND and nb_concierges > 0:
                         validation_ok = False
                         problemes.append("Concierge interdit le weekend")
                     if shift == 'apres_midi' and nb_concierges > 0:
                         validation_ok = False
                         problemes.append("Concierge interdit l'après-midi")
                 
+                total_shifts += 1
+                problemes_count += not validation_ok
+
                 validation_data.append({
                     'Jour': f"{jour} {date_str}",
                     'Shift': shift.replace('_', ' ').title(),
@@ -646,135 +948,166 @@ class HotelPlanningSystem:
                 })
         
         # En-têtes du tableau de validation
-        row = 3
-        validation_headers = ['Jour', 'Shift', 'Total', 'Superviseurs', 'Réceptionnistes', 'Concierge', 'Statut', 'Détails']
-        for col, header in enumerate(validation_headers, 1):
-            cell = ws_validation.cell(row=row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        
+        ws_validation.append([
+            _cellule(ws_validation, header, font=_FONT_GRAS, fill=_COULEUR_HEADER)
+            for header in _ENTETES_VALIDATION
+        ])
+
         # Remplissage des données de validation
-        row += 1
         for data in validation_data:
-            for col, header in enumerate(validation_headers, 1):
-                cell = ws_validation.cell(row=row, column=col, value=data[header])
-                # Coloration selon le statut
-                if data['Statut'] == 'PROBLÈME':
-                    cell.fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-                elif data['Statut'] == 'OK':
-                    cell.fill = PatternFill(start_color="CCFFCC", end_color="CCFFCC", fill_type="solid")
-            row += 1
-        
-        # Ajustement des largeurs pour la validation
-        column_widths_validation = [12, 12, 8, 12, 15, 10, 10, 40]
-        for i, width in enumerate(column_widths_validation, 1):
-            ws_validation.column_dimensions[chr(64 + i)].width = width
-        
-        # Statistiques de validation
-        problemes_count = len([v for v in validation_data if v['Statut'] == 'PROBLÈME'])
-        total_shifts = len(validation_data)
-        
-        row += 2
-        ws_validation.cell(row=row, column=1, value="RÉSUMÉ DE VALIDATION").font = Font(bold=True, size=12)
-        row += 1
+            # Coloration selon le statut (remplissages partagés, pas d'allocation par cellule)
+            fill = _COULEUR_PROBLEME if data['Statut'] == 'PROBLÈME' else _COULEUR_OK
+            ws_validation.append([_cellule(ws_validation, data[header], fill=fill)
+                                  for header in _ENTETES_VALIDATION])
+
+        # Statistiques de validation (déjà comptées pendant la construction des lignes)
+        ws_validation.append([])
+        ws_validation.append([_cellule(ws_validation, "RÉSUMÉ DE VALIDATION", font=_FONT_SECTION)])
         if problemes_count == 0:
-            cell = ws_validation.cell(row=row, column=1, value=f"✅ Planning parfaitement valide ! Tous les {total_shifts} shifts respectent les contraintes.")
-            cell.fill = PatternFill(start_color="CCFFCC", end_color="CCFFCC", fill_type="solid")
+            ws_validation.append([_cellule(
+                ws_validation,
+                f"✅ Planning parfaitement valide ! Tous les {total_shifts} shifts respectent les contraintes.",
+                fill=_COULEUR_OK)])
         else:
-            cell = ws_validation.cell(row=row, column=1, value=f"❌ {problemes_count} problème(s) détecté(s) sur {total_shifts} shifts.")
-            cell.fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-        
+            ws_validation.append([_cellule(
+                ws_validation,
+                f"❌ {problemes_count} problème(s) détecté(s) sur {total_shifts} shifts.",
+                fill=_COULEUR_PROBLEME)])
+
         # Feuille 3: Analyse détaillée
         ws_analyse = wb.create_sheet("Analyse")
-        
+
+        # Ajustement des largeurs de colonnes pour l'analyse
+        for col in range(1, 8):
+            ws_analyse.column_dimensions[get_column_letter(col)].width = 20
+
         # Heures par employé
-        ws_analyse['A1'] = "ANALYSE DES HEURES PAR EMPLOYÉ"
-        ws_analyse['A1'].font = Font(bold=True, size=12)
-        
-        row = 3
-        headers = ['Employé', 'Rôle', 'Contrat', 'Jours Travaillés', 'Jours Contractuels', 'Heures', 'Conforme']
-        for col, header in enumerate(headers, 1):
-            cell = ws_analyse.cell(row=row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-        
-        row += 1
+        ws_analyse.append([_cellule(ws_analyse, "ANALYSE DES HEURES PAR EMPLOYÉ", font=_FONT_SECTION)])
+        ws_analyse.append([])
+
+        ws_analyse.append([
+            _cellule(ws_analyse, header, font=_FONT_GRAS,
+                     fill=_COULEUR_HEADER)
+            for header in _ENTETES_ANALYSE
+        ])
+
         for emp_nom, data in analyse['heures_par_employe'].items():
-            ws_analyse.cell(row=row, column=1, value=emp_nom)
-            ws_analyse.cell(row=row, column=2, value=data['role'])
-            ws_analyse.cell(row=row, column=3, value=data['type_contrat'])
-            ws_analyse.cell(row=row, column=4, value=data['jours_travailles'])
-            ws_analyse.cell(row=row, column=5, value=data['jours_contractuels'])
-            ws_analyse.cell(row=row, column=6, value=data['heures'])
-            ws_analyse.cell(row=row, column=7, value="OUI" if data['respect_contrat'] else "NON")
-            
             # Coloration selon le rôle
-            role_color = couleurs_roles.get(data['role'])
-            if role_color:
-                for col in range(1, 8):
-                    ws_analyse.cell(row=row, column=col).fill = role_color
-            
-            row += 1
-        
+            role_color = _COULEURS_ROLES.get(data['role'])
+            valeurs = [emp_nom, data['role'], data['type_contrat'], data['jours_travailles'],
+                       data['jours_contractuels'], data['heures'],
+                       "OUI" if data['respect_contrat'] else "NON"]
+            ws_analyse.append([_cellule(ws_analyse, v, fill=role_color) for v in valeurs])
+
         # Violations
-        row += 2
-        ws_analyse.cell(row=row, column=1, value="VIOLATIONS DE CONTRAINTES").font = Font(bold=True, size=12)
-        row += 1
-        
+        ws_analyse.append([])
+        ws_analyse.append([_cellule(ws_analyse, "VIOLATIONS DE CONTRAINTES", font=_FONT_SECTION)])
+
         if analyse['violations_contraintes']:
             for violation in analyse['violations_contraintes']:
-                ws_analyse.cell(row=row, column=1, value=violation)
-                ws_analyse.cell(row=row, column=1).fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-                row += 1
+                ws_analyse.append([_cellule(
+                    ws_analyse, violation,
+                    fill=_COULEUR_PROBLEME)])
         else:
-            ws_analyse.cell(row=row, column=1, value="Aucune violation détectée ✓")
-            ws_analyse.cell(row=row, column=1).fill = PatternFill(start_color="CCFFCC", end_color="CCFFCC", fill_type="solid")
-        
+            ws_analyse.append([_cellule(
+                ws_analyse, "Aucune violation détectée ✓",
+                fill=_COULEUR_OK)])
+
         # Statistiques globales
-        row += 2
-        ws_analyse.cell(row=row, column=1, value="STATISTIQUES GLOBALES").font = Font(bold=True, size=12)
-        row += 1
-        
+        ws_analyse.append([])
+        ws_analyse.append([_cellule(ws_analyse, "STATISTIQUES GLOBALES", font=_FONT_SECTION)])
+
         stats = analyse['statistiques_globales']
-        ws_analyse.cell(row=row, column=1, value=f"Total shifts semaine: {stats['total_shifts_semaine']}")
-        row += 1
-        ws_analyse.cell(row=row, column=1, value=f"Total heures semaine: {stats['total_heures_semaine']}")
-        row += 1
-        ws_analyse.cell(row=row, column=1, value=f"Employés actifs: {stats['nombre_employes_actifs']}")
-        
-        # Ajustement des largeurs de colonnes pour l'analyse
-        for col in range(1, 8):
-            ws_analyse.column_dimensions[chr(64 + col)].width = 20
-        
+        resume_stats = (f"Total shifts semaine: {stats['total_shifts_semaine']}\n"
+                        f"Total heures semaine: {stats['total_heures_semaine']}\n"
+                        f"Employés actifs: {stats['nombre_employes_actifs']}")
+        ws_analyse.append([_cellule(ws_analyse, resume_stats, alignement=_RETOUR_LIGNE)])
+
         # Feuille 4: Planning individuel (SUPPRIMÉE - déjà dans la feuille principale)
-        # Cette feuille n'est plus nécessaire car le format tableau principal 
+        # Cette feuille n'est plus nécessaire car le format tableau principal
         # montre déjà le planning individuel de chaque employé
-        
-        # Sauvegarde en bytes
-        excel_buffer = io.BytesIO()
-        wb.save(excel_buffer)
-        excel_buffer.seek(0)
-        return excel_buffer.getvalue()
+
+        # Sauvegarde en bytes : tampon en mémoire jusqu'à 8 Mo, débordement sur
+        # disque au-delà (gros plannings), et une seule copie à la lecture
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as excel_buffer:
+            wb.save(excel_buffer)
+            excel_buffer.seek(0)
+            return excel_buffer.read()
 
 
 # ================================
 # INITIALISATION PAR DEFAUT
 # ================================
+# Langues reconnues comme compétences linguistiques (les langues ajoutées via
+# l'interface s'y joignent en session)
+_LANGUES_BASE = ("Anglais", "Français", "Espagnol", "Italien", "Allemand", "Portugais",
+                 "Russe", "Chinois", "Japonais", "Arabe", "Hindi", "Néerlandais",
+                 "Suédois", "Norvégien", "Danois")
+_LANGUES_BASE_SET = frozenset(_LANGUES_BASE)
+
+# Jeux de compétences par défaut : tuples partagés entre les employés qui les
+# portent (une seule allocation par jeu)
+_COMPETENCES_SUPERVISEUR = ("Management", "Accueil", "Anglais", "Formation")
+_COMPETENCES_RECEPTION = ("Accueil", "Anglais")
+_COMPETENCES_NUIT = ("Accueil", "Anglais", "Sécurité")
+_COMPETENCES_CONCIERGE = ("Conciergerie", "Anglais", "Tourisme")
+
+
+# Libellés d'affichage des rôles et contrats : le vocabulaire est fermé, un
+# dictionnaire évite de repasser par .replace().title() dans les boucles de
+# rendu (repli sur le calcul pour une valeur inattendue)
+_AFFICHAGE_ROLES = {'superviseur': 'Superviseur', 'receptionniste': 'Receptionniste', 'concierge': 'Concierge'}
+_AFFICHAGE_CONTRATS = {'temps_plein': 'Temps Plein', 'mi_temps_4j': 'Mi Temps 4J', 'mi_temps_3j': 'Mi Temps 3J', 'nuit': 'Nuit'}
+
+
+def _libelle_role(role: str) -> str:
+    return _AFFICHAGE_ROLES.get(role) or role.title()
+
+
+def _libelle_contrat(type_contrat: str) -> str:
+    return _AFFICHAGE_CONTRATS.get(type_contrat) or type_contrat.replace('_', ' ').title()
+
+
+# Compétences proposées par les sélecteurs (tronc métier puis langues de base ;
+# l'anglais figure déjà dans le tronc commun)
+_COMPETENCES_DISPONIBLES = ("Accueil", "Anglais", "Management", "Conciergerie",
+                            "Tourisme", "Sécurité", "Formation") + _LANGUES_BASE[1:]
+_COMPETENCES_DISPONIBLES_SET = frozenset(_COMPETENCES_DISPONIBLES)
+
+# Compétences proposées par défaut selon le rôle choisi dans le formulaire
+_COMPETENCES_PAR_ROLE = {
+    "superviseur": _COMPETENCES_SUPERVISEUR,
+    "receptionniste": _COMPETENCES_RECEPTION,
+    "concierge": _COMPETENCES_CONCIERGE,
+}
+
+# Scénarios d'absences partielles simulées : (motif, jours min, jours max)
+_SCENARIOS_ABSENCES = (
+    ("Maladie", 1, 2),
+    ("RTT", 1, 1),
+    ("Rendez-vous médical", 1, 1),
+    ("Formation", 2, 3),
+    ("Congés payés", 2, 4),
+)
+
+
 def initialiser_equipe_conforme(system):
     """Initialise une équipe conforme aux contraintes du projet - 15 personnes"""
     if system.employees:
         return
 
+    equipe = []
+
     # === 5 SUPERVISEURS (qui font aussi réceptionnistes) ===
     for i in range(1, 6):
-        system.ajouter_employe(Employee(
+        equipe.append(Employee(
             prenom=f"Superviseur{i}",
             nom=f"Manager{i}",
             type_contrat="temps_plein",
             jours_semaine=5,
             role="superviseur",
             contraintes_speciales={},
-            competences=["Management", "Accueil", "Anglais", "Formation"],
+            competences=_COMPETENCES_SUPERVISEUR,
             disponible=True,
             motif_indisponibilite="",
             jours_absence=0
@@ -783,42 +1116,42 @@ def initialiser_equipe_conforme(system):
     # === 6 RÉCEPTIONNISTES JOUR ===
     # 4 réceptionnistes temps plein
     for i in range(1, 5):
-        system.ajouter_employe(Employee(
+        equipe.append(Employee(
             prenom=f"Recep{i}",
             nom=f"Jour{i}",
             type_contrat="temps_plein",
             jours_semaine=5,
             role="receptionniste",
             contraintes_speciales={},
-            competences=["Accueil", "Anglais"],
+            competences=_COMPETENCES_RECEPTION,
             disponible=True,
             motif_indisponibilite="",
             jours_absence=0
         ))
-    
+
     # 1 réceptionniste mi-temps 4 jours
-    system.ajouter_employe(Employee(
+    equipe.append(Employee(
         prenom="RecepPT1",
         nom="Partiel4j",
         type_contrat="mi_temps_4j",
         jours_semaine=4,
         role="receptionniste",
         contraintes_speciales={},
-        competences=["Accueil", "Anglais"],
+        competences=_COMPETENCES_RECEPTION,
         disponible=True,
         motif_indisponibilite="",
         jours_absence=0
     ))
-    
+
     # 1 réceptionniste mi-temps 3 jours
-    system.ajouter_employe(Employee(
+    equipe.append(Employee(
         prenom="RecepPT2",
         nom="Partiel3j",
         type_contrat="mi_temps_3j",
         jours_semaine=3,
         role="receptionniste",
         contraintes_speciales={},
-        competences=["Accueil", "Anglais"],
+        competences=_COMPETENCES_RECEPTION,
         disponible=True,
         motif_indisponibilite="",
         jours_absence=0
@@ -826,180 +1159,258 @@ def initialiser_equipe_conforme(system):
 
     # === 3 RÉCEPTIONNISTES DE NUIT ===
     for i in range(1, 4):
-        system.ajouter_employe(Employee(
+        equipe.append(Employee(
             prenom=f"Night{i}",
             nom=f"Nuit{i}",
             type_contrat="nuit",
             jours_semaine=5,
             role="receptionniste",
             contraintes_speciales={"horaires": "nuit"},
-            competences=["Accueil", "Anglais", "Sécurité"],
+            competences=_COMPETENCES_NUIT,
             disponible=True,
             motif_indisponibilite="",
             jours_absence=0
         ))
 
     # === 1 CONCIERGE (off weekend, uniquement matin) ===
-    system.ajouter_employe(Employee(
+    equipe.append(Employee(
         prenom="Concierge",
         nom="Principal",
         type_contrat="temps_plein",
         jours_semaine=5,
         role="concierge",
         contraintes_speciales={"jours_off": "weekend", "horaires": "matin_uniquement"},
-        competences=["Conciergerie", "Anglais", "Tourisme"],
+        competences=_COMPETENCES_CONCIERGE,
         disponible=True,
         motif_indisponibilite="",
         jours_absence=0
     ))
 
-# ================================
-# APPLICATION STREAMLIT
-# ================================
-def main():
-    st.set_page_config(page_title="Planning Front Office Hôtelier", layout="wide")
-    st.title("🏨 Système de Planning Front Office Hôtelier")
-    st.markdown("**Optimisation des plannings avec contraintes réelles - Équipe de 15 personnes**")
+    # Un seul extend + une seule mise à jour des index, plutôt que 15 insertions
+    system.ajouter_employes(equipe)
+
+_COLONNES_EQUIPE = ('Statut', 'Prénom', 'Nom', 'Rôle', 'Contrat', 'Jours Contractuels',
+                    'Jours Absence', 'Jours Travail Max', 'Disponibilité', 'Compétences')
+
+
+@lru_cache(maxsize=64)
+def _texte_statut(disponible, jours_absence, jours_travail_max, jours_semaine, motif):
+    """Texte de disponibilité d'un employé, mémoïsé sur ses composantes.
+
+    L'équipe ne produit qu'une poignée de combinaisons distinctes : après le
+    premier rendu, l'interpolation devient une lecture de cache.
+    """
+    if disponible and jours_absence > 0:
+        return f"Partiellement disponible ({jours_travail_max}/{jours_semaine}j) - {motif}"
+    if disponible:
+        return f"Disponible ({jours_semaine}j)"
+    return f"Indisponible - {motif}"
+
+
+@st.cache_data(show_spinner=False)
+def _tableau_equipe(lignes) -> pd.DataFrame:
+    """DataFrame du tableau d'équipe, mémoïsé sur le contenu des lignes.
+
+    Les reruns déclenchés par des widgets sans rapport (occupation, export...)
+    retrouvent le DataFrame déjà construit tant que l'équipe n'a pas changé.
+    """
+    df_data = []
+    for (prenom, nom, role, type_contrat, jours_semaine, jours_absence,
+         jours_travail_max, disponible, motif, competences) in lignes:
+        status_icon = "✅" if disponible else "❌"
+        status_text = _texte_statut(disponible, jours_absence, jours_travail_max,
+                                    jours_semaine, motif)
+
+        df_data.append((
+            status_icon, prenom, nom, _libelle_role(role), _libelle_contrat(type_contrat),
+            jours_semaine, jours_absence if disponible else "N/A", jours_travail_max,
+            status_text, ', '.join(competences),
+        ))
+
+    return pd.DataFrame.from_records(df_data, columns=_COLONNES_EQUIPE)
+
+
+_CSS_SHIFT_MATIN = 'background-color: #FFFFCC; color: #000000; font-weight: bold; text-align: center'
+_CSS_SHIFT_APRES_MIDI = 'background-color: #FFCCFF; color: #000000; font-weight: bold; text-align: center'
+_CSS_SHIFT_NUIT = 'background-color: #CCCCFF; color: #000000; font-weight: bold; text-align: center'
+_CSS_SHIFT_VIDE = 'background-color: #F9F9F9; text-align: center'
 
-    if 'planning_system' not in st.session_state:
-        st.session_state.planning_system = HotelPlanningSystem()
 
-    system = st.session_state.planning_system
-    if not system.employees:
-        initialiser_equipe_conforme(system)
+def _styles_heures(df: pd.DataFrame) -> pd.DataFrame:
+    """Style du tableau des heures : lignes rouges si contrat non respecté"""
+    css = np.where(df['respect_contrat'].to_numpy()[:, None], '', 'background-color: #ffcccc')
+    return pd.DataFrame(np.broadcast_to(css, df.shape), index=df.index, columns=df.columns)
+
+
+def _styles_validation(df: pd.DataFrame) -> pd.DataFrame:
+    """Style du tableau de validation : lignes rouges si problème, vertes sinon"""
+    css = np.where(df['Statut'].to_numpy() == '❌ Problème',
+                   'background-color: #ffcccc', 'background-color: #ccffcc')
+    return pd.DataFrame(np.broadcast_to(css[:, None], df.shape),
+                        index=df.index, columns=df.columns)
+
+
+def _styles_colonne_shift(col: pd.Series) -> np.ndarray:
+    """Styles d'une colonne de shifts, en un np.select sur les quatre valeurs
+    possibles de cellule (appelé via Styler.apply, pas par cellule)"""
+    valeurs = col.to_numpy()
+    return np.select(
+        [valeurs == "🌅 M", valeurs == "🌆 AM", valeurs == "🌙 N"],
+        [_CSS_SHIFT_MATIN, _CSS_SHIFT_APRES_MIDI, _CSS_SHIFT_NUIT],
+        default=_CSS_SHIFT_VIDE,
+    )
+
+
+def _styles_equipe(df: pd.DataFrame) -> pd.DataFrame:
+    """Styles conditionnels du tableau d'équipe, calculés colonne par colonne.
+
+    Appelé via Styler.apply(axis=None) : une seule passe NumPy sur tout le
+    tableau plutôt qu'un rappel Python par ligne.
+    """
+    indisponible = (df['Statut'] == '❌').to_numpy()
+    jours_max = df['Jours Travail Max'].to_numpy()
+    partiel = (jours_max < df['Jours Contractuels'].to_numpy()) & (jours_max > 0)
+    couleurs = np.where(indisponible, 'background-color: #ffecec; color: #666666',
+                        np.where(partiel, 'background-color: #fff8e1; color: #333333', ''))
+    return pd.DataFrame(np.broadcast_to(couleurs[:, None], df.shape),
+                        index=df.index, columns=df.columns)
+
+
+def _empreinte_equipe(system) -> Tuple:
+    """Empreinte hashable de l'équipe, pour invalider les caches Streamlit.
+
+    Reprend tous les champs qui influencent l'optimisation : si l'un d'eux
+    change (disponibilité, absence, contrat...), l'empreinte change et le
+    planning est recalculé.
+    """
+    return tuple(
+        (e.prenom, e.nom, e.role, e.type_contrat, e.jours_semaine,
+         e.disponible, e.jours_absence, e.jours_off_consecutifs)
+        for e in system.employees
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _generer_planning_cache(_system, empreinte_equipe, checkins, checkouts, semaine_debut):
+    """Appelle le solveur, mémoïsé sur l'empreinte d'équipe et l'occupation.
+
+    Regénérer le même planning (mêmes employés, mêmes arrivées/départs,
+    même semaine) ne relance pas le solveur ILP. Le système lui-même est
+    passé avec un underscore pour être exclu du calcul de la clé de cache.
+    """
+    return _system.generer_planning_optimise(checkins, checkouts, semaine_debut)
+
+
+_MODES_EQUIPE = ("✅ Tous disponibles", "🏖️ Weekend équipe réduite", "🎯 Occupation faible")
+
+
+def _appliquer_mode_equipe(system, mode):
+    """Applique un des modes d'équipe prédéfinis et renvoie le message à afficher.
+
+    Les sélections se lisent dans les partitions par rôle (déjà en cache pour
+    le solveur) : pas de re-branchement rôle/contrat employé par employé.
+    """
+    if mode == "✅ Tous disponibles":
+        a_garder = None  # tout le monde
+        motif_absent = ""
+        message = "✅ Toute l'équipe marquée comme disponible"
+    elif mode == "🏖️ Weekend équipe réduite":
+        superviseurs, recep_jour, recep_nuit, concierges = system._partitions_roles()
+        a_garder = set(map(id, superviseurs)) | set(map(id, recep_nuit))
+        motif_absent = "Congés"
+        message = "ℹ️ Mode équipe réduite activé (superviseurs + nuit seulement)"
+    else:  # Occupation faible : 2 superviseurs, 1 jour, toute la nuit
+        superviseurs, recep_jour, recep_nuit, concierges = system._partitions_roles()
+        a_garder = set(map(id, superviseurs[:2])) | set(map(id, recep_jour[:1])) | set(map(id, recep_nuit))
+        motif_absent = "Congés - Occupation faible"
+        message = "ℹ️ Mode occupation faible activé (équipe minimale)"
+
+    for emp in system.employees:
+        garde = a_garder is None or id(emp) in a_garder
+        emp.disponible = garde
+        emp.motif_indisponibilite = "" if garde else motif_absent
+    return message
+
+
+@st.fragment
+def _onglet_equipe(system):
+    """Onglet Équipe, isolé dans un fragment Streamlit.
+
+    Les interactions internes (expanders, boutons d'équipe) ne
+    redéclenchent que ce fragment et ne redessinent pas les onglets
+    de planification ; les actions qui changent l'état global
+    (disponibilités, suppression...) passent par st.rerun().
+    """
+    st.header("👥 Gestion de l'Équipe (15 personnes)")
+
+    # Libellés de sélecteurs construits une fois par rerun et partagés par
+    # les expanders (les selectbox renvoient l'indice, pas le libellé)
+    libelles_equipe = [f"{e.prenom} {e.nom} ({e.role})" for e in system.employees]
 
-    # === SIDEBAR ===
-    with st.sidebar:
-        st.header("⚙️ Configuration")
-        st.metric("Capacité hôtel", f"{system.hotel_capacity} chambres")
-        st.metric("1 réceptionniste pour", f"{system.clients_per_receptionist} clients")
-        st.metric("Max équipe par shift", f"{system.max_receptionists_per_shift} personnes")
-        
-        st.markdown("---")
-        st.markdown("**Composition équipe (15 personnes):**")
-        st.metric("Superviseurs", f"{system.nb_supervisors} (font aussi réceptionnistes)")
-        st.metric("Réceptionnistes jour", system.nb_receptionnistes_jour)
-        st.metric("Réceptionnistes nuit", f"{system.nb_night_receptionists_required}/shift")
-        st.metric("Concierge", system.nb_concierges)
-        
-        st.markdown("---")
-        st.markdown("**Contraintes principales:**")
-        st.markdown("• 2 jours off/semaine par employé")
-        st.markdown("• Max 5 jours consécutifs")
-        st.markdown("• Au moins 1 superviseur/shift jour")
-        st.markdown("• Concierge: matin seulement, off weekend")
-        st.markdown("• 2 réceptionnistes/nuit")
+    if system.employees:
+        st.subheader("📋 Composition Actuelle")
 
-    # === TABS ===
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["👥 Équipe", "📊 Occupation", "📅 Planning", "📈 Analyse", "📥 Export"])
+        # Résumé par type avec statuts : partitions en cache, un seul passage
+        # pour compter les disponibles (au lieu de 9 parcours de l'équipe)
+        superviseurs, recep_jour, recep_nuit, concierges = system._partitions_roles()
+        cols = st.columns(4)
+        with cols[0]:
+            nb_superviseurs_dispo = sum(e.disponible for e in superviseurs)
+            st.metric("Superviseurs", f"{nb_superviseurs_dispo}/{len(superviseurs)}", help="Disponibles/Total")
+        with cols[1]:
+            nb_recep_jour_dispo = sum(e.disponible for e in recep_jour)
+            st.metric("Réceptionnistes jour", f"{nb_recep_jour_dispo}/{len(recep_jour)}", help="Disponibles/Total")
+        with cols[2]:
+            nb_recep_nuit_dispo = sum(e.disponible for e in recep_nuit)
+            st.metric("Réceptionnistes nuit", f"{nb_recep_nuit_dispo}/{len(recep_nuit)}", help="Disponibles/Total")
+        with cols[3]:
+            nb_concierges_dispo = sum(e.disponible for e in concierges)
+            st.metric("Concierge", f"{nb_concierges_dispo}/{len(concierges)}", help="Disponibles/Total")
 
-    # === TAB 1: Gestion Équipe ===
-    with tab1:
-        st.header("👥 Gestion de l'Équipe (15 personnes)")
-        
-        if system.employees:
-            st.subheader("📋 Composition Actuelle")
-            
-            # Résumé par type avec statuts
-            cols = st.columns(4)
-            with cols[0]:
-                nb_superviseurs = len([e for e in system.employees if e.role == 'superviseur'])
-                nb_superviseurs_dispo = len([e for e in system.employees if e.role == 'superviseur' and e.disponible])
-                st.metric("Superviseurs", f"{nb_superviseurs_dispo}/{nb_superviseurs}", help="Disponibles/Total")
-            with cols[1]:
-                nb_recep_jour = len([e for e in system.employees if e.role == 'receptionniste' and e.type_contrat != 'nuit'])
-                nb_recep_jour_dispo = len([e for e in system.employees if e.role == 'receptionniste' and e.type_contrat != 'nuit' and e.disponible])
-                st.metric("Réceptionnistes jour", f"{nb_recep_jour_dispo}/{nb_recep_jour}", help="Disponibles/Total")
-            with cols[2]:
-                nb_recep_nuit = len([e for e in system.employees if e.role == 'receptionniste' and e.type_contrat == 'nuit'])
-                nb_recep_nuit_dispo = len([e for e in system.employees if e.role == 'receptionniste' and e.type_contrat == 'nuit' and e.disponible])
-                st.metric("Réceptionnistes nuit", f"{nb_recep_nuit_dispo}/{nb_recep_nuit}", help="Disponibles/Total")
-            with cols[3]:
-                nb_concierges = len([e for e in system.employees if e.role == 'concierge'])
-                nb_concierges_dispo = len([e for e in system.employees if e.role == 'concierge' and e.disponible])
-                st.metric("Concierge", f"{nb_concierges_dispo}/{nb_concierges}", help="Disponibles/Total")
-            
-            # Vérification de la faisabilité
-            employes_disponibles = len([e for e in system.employees if e.disponible])
-            total_equipe = len(system.employees)
-            
-            if employes_disponibles >= 8:  # Minimum viable
-                st.success(f"✅ Équipe opérationnelle : {employes_disponibles}/{total_equipe} personnes disponibles")
-            elif employes_disponibles >= 5:
-                st.warning(f"⚠️ Équipe réduite : {employes_disponibles}/{total_equipe} personnes disponibles - Planning limité possible")
-            else:
-                st.error(f"❌ Équipe insuffisante : {employes_disponibles}/{total_equipe} personnes disponibles - Planning impossible")
-            
-            # Tableau détaillé avec statuts et jours d'absence
-            df_data = []
-            for e in system.employees:
-                status_icon = "✅" if e.disponible else "❌"
-                if e.disponible and e.jours_absence > 0:
-                    status_text = f"Partiellement disponible ({e.jours_travail_max_semaine}/{e.jours_semaine}j) - {e.motif_indisponibilite}"
-                elif e.disponible:
-                    status_text = f"Disponible ({e.jours_semaine}j)"
-                else:
-                    status_text = f"Indisponible - {e.motif_indisponibilite}"
-                
-                df_data.append({
-                    'Statut': status_icon,
-                    'Prénom': e.prenom,
-                    'Nom': e.nom,
-                    'Rôle': e.role.title(),
-                    'Contrat': e.type_contrat.replace('_', ' ').title(),
-                    'Jours Contractuels': e.jours_semaine,
-                    'Jours Absence': e.jours_absence if e.disponible else "N/A",
-                    'Jours Travail Max': e.jours_travail_max_semaine,
-                    'Disponibilité': status_text,
-                    'Compétences': ', '.join(e.competences)
-                })
-            
-            df = pd.DataFrame(df_data)
-            
-            # Style conditionnel pour le tableau
-            def highlight_status(row):
-                colors = []
-                for col in df.columns:
-                    if row['Statut'] == '❌':
-                        colors.append('background-color: #ffecec; color: #666666')
-                    elif row['Jours Travail Max'] < row['Jours Contractuels'] and row['Jours Travail Max'] > 0:
-                        colors.append('background-color: #fff8e1; color: #333333')
-                    else:
-                        colors.append('')
-                return colors
-            
-            styled_df = df.style.apply(highlight_status, axis=1)
-            st.dataframe(styled_df, use_container_width=True)
+        # Vérification de la faisabilité
+        employes_disponibles = sum(e.disponible for e in system.employees)
+        total_equipe = len(system.employees)
+
+        if employes_disponibles >= 8:  # Minimum viable
+            st.success(f"✅ Équipe opérationnelle : {employes_disponibles}/{total_equipe} personnes disponibles")
+        elif employes_disponibles >= 5:
+            st.warning(f"⚠️ Équipe réduite : {employes_disponibles}/{total_equipe} personnes disponibles - Planning limité possible")
+        else:
+            st.error(f"❌ Équipe insuffisante : {employes_disponibles}/{total_equipe} personnes disponibles - Planning impossible")
+
+        # Tableau détaillé avec statuts et jours d'absence (mémoïsé sur le
+        # contenu des lignes, style vectorisé)
+        lignes_equipe = tuple(
+            (e.prenom, e.nom, e.role, e.type_contrat, e.jours_semaine,
+             e.jours_absence, e.jours_travail_max_semaine, e.disponible,
+             e.motif_indisponibilite, tuple(e.competences))
+            for e in system.employees
+        )
+        df = _tableau_equipe(lignes_equipe)
+        styled_df = df.style.apply(_styles_equipe, axis=None)
+        st.dataframe(styled_df, use_container_width=True)
+
+    # Gestion des disponibilités
+    with st.expander("📋 Gestion des Disponibilités"):
+        st.markdown("**Marquer des employés comme indisponibles (maladie, congés, etc.)**")
+
+        # Les outils individuels (libellés, sélecteur, formulaires) ne sont
+        # construits que sur demande : un expander replié exécute quand
+        # même son corps à chaque rerun
+        if st.checkbox("Modifier un employé individuellement", key="show_avail_tools"):
+            # Sélection par position : le selectbox rend le libellé mais
+            # renvoie l'indice, plus rien à reparser
+            idx_dispo = st.selectbox(
+                "Choisir l'employé", options=range(len(system.employees)),
+                format_func=lambda i: f"{libelles_equipe[i]} - {'Disponible' if system.employees[i].disponible else 'Indisponible'}",
+                key="modify_availability")
+
+            if idx_dispo is not None:
+                employe_sel = system.employees[idx_dispo]
 
-        # Gestion des disponibilités
-        with st.expander("📋 Gestion des Disponibilités"):
-            st.markdown("**Marquer des employés comme indisponibles (maladie, congés, etc.)**")
-            
-            # Sélection d'un employé à modifier
-            employes_options = [f"{e.prenom} {e.nom} ({e.role}) - {'Disponible' if e.disponible else 'Indisponible'}" for e in system.employees]
-            employe_a_modifier_dispo = st.selectbox("Choisir l'employé", options=employes_options, key="modify_availability")
-            
-            if employe_a_modifier_dispo:
-                # Trouver l'employé sélectionné
-                prenom_nom_info = employe_a_modifier_dispo.split(' (')[0]
-                parts = prenom_nom_info.split(' ')
-                if len(parts) >= 2:
-                    prenom_sel = parts[0]
-                    nom_sel = ' '.join(parts[1:])
-                else:
-                    prenom_sel = parts[0]
-                    nom_sel = ""
-                
-                # Trouver l'objet employé
-                employe_sel = None
-                for emp in system.employees:
-                    if emp.prenom == prenom_sel and emp.nom == nom_sel:
-                        employe_sel = emp
-                        break
-                
                 if employe_sel:
                     col1, col2 = st.columns(2)
-                    
+
                     with col1:
                         nouveau_statut = st.radio(
                             f"Statut de {employe_sel.prenom} {employe_sel.nom}",
@@ -1009,7 +1420,7 @@ def main():
                                        else 2),
                             key="availability_status"
                         )
-                        
+
                         # Nombre de jours d'absence si partiellement disponible
                         jours_absence = 0
                         if nouveau_statut == "Partiellement disponible":
@@ -1020,10 +1431,10 @@ def main():
                                 value=min(employe_sel.jours_absence if employe_sel.jours_absence > 0 else 1, employe_sel.jours_semaine),
                                 key="days_absence"
                             )
-                            
+
                             jours_travail_restants = employe_sel.jours_semaine - jours_absence
                             st.info(f"📊 Jours de travail restants : {jours_travail_restants}/{employe_sel.jours_semaine}")
-                    
+
                     with col2:
                         motif = ""
                         if nouveau_statut in ["Partiellement disponible", "Indisponible"]:
@@ -1033,19 +1444,19 @@ def main():
                                         "Accident de travail", "Congé sans solde", "Rendez-vous médical", "Autre"],
                                 key="unavailability_reason"
                             )
-                            
+
                             if motif == "Autre":
                                 motif = st.text_input("Préciser le motif", key="custom_reason")
-                        
+
                         # Affichage des informations contractuelles
                         st.write("**Informations contractuelles :**")
-                        st.write(f"• Contrat : {employe_sel.type_contrat.replace('_', ' ').title()}")
+                        st.write(f"• Contrat : {_libelle_contrat(employe_sel.type_contrat)}")
                         st.write(f"• Jours contractuels : {employe_sel.jours_semaine} jours/semaine")
                         if nouveau_statut == "Partiellement disponible":
                             st.write(f"• **Disponible : {employe_sel.jours_semaine - jours_absence} jours cette semaine**")
-                    
+
                     col_save, col_reset = st.columns([1, 1])
-                    
+
                     with col_save:
                         if st.button("💾 Mettre à jour le statut", key="update_availability"):
                             if nouveau_statut == "Disponible":
@@ -1065,7 +1476,7 @@ def main():
                                 employe_sel.motif_indisponibilite = motif
                                 st.error(f"❌ {employe_sel.prenom} {employe_sel.nom} - Indisponible - {motif}")
                             st.rerun()
-                    
+
                     with col_reset:
                         if st.button("🔄 Remettre à 100%", key="reset_to_full"):
                             employe_sel.disponible = True
@@ -1073,884 +1484,928 @@ def main():
                             employe_sel.motif_indisponibilite = ""
                             st.success(f"✅ {employe_sel.prenom} {employe_sel.nom} remis à 100% disponible")
                             st.rerun()
-            
-            # Actions de groupe
-            st.markdown("---")
-            st.markdown("**Actions rapides sur l'équipe :**")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                if st.button("✅ Tous disponibles", key="all_available"):
-                    for emp in system.employees:
-                        emp.disponible = True
-                        emp.motif_indisponibilite = ""
-                    st.success("✅ Toute l'équipe marquée comme disponible")
-                    st.rerun()
-            
-            with col2:
-                if st.button("🏖️ Weekend équipe réduite", key="reduced_weekend"):
-                    # Garde seulement les superviseurs et réceptionnistes de nuit disponibles
-                    for emp in system.employees:
-                        if emp.role in ['superviseur'] or (emp.role == 'receptionniste' and emp.type_contrat == 'nuit'):
-                            emp.disponible = True
-                            emp.motif_indisponibilite = ""
-                        else:
-                            emp.disponible = False
-                            emp.motif_indisponibilite = "Congés"
-                    st.info("ℹ️ Mode équipe réduite activé (superviseurs + nuit seulement)")
-                    st.rerun()
-            
-            with col3:
-                if st.button("🎯 Occupation faible", key="low_occupation"):
-                    # Garde 2-3 superviseurs, 1-2 réceptionnistes jour, 2 nuit, pas de concierge
-                    count_superviseurs = 0
-                    count_recep_jour = 0
-                    for emp in system.employees:
-                        if emp.role == 'superviseur' and count_superviseurs < 2:
-                            emp.disponible = True
-                            emp.motif_indisponibilite = ""
-                            count_superviseurs += 1
-                        elif emp.role == 'receptionniste' and emp.type_contrat != 'nuit' and count_recep_jour < 1:
-                            emp.disponible = True  
-                            emp.motif_indisponibilite = ""
-                            count_recep_jour += 1
-                        elif emp.role == 'receptionniste' and emp.type_contrat == 'nuit':
-                            emp.disponible = True
-                            emp.motif_indisponibilite = ""
-                        else:
-                            emp.disponible = False
-                            emp.motif_indisponibilite = "Congés - Occupation faible"
-                    st.info("ℹ️ Mode occupation faible activé (équipe minimale)")
-                    st.rerun()
 
-        with st.expander("➕ Ajouter un Employé"):
-            col1, col2 = st.columns(2)
-            with col1:
-                prenom = st.text_input("Prénom")
-                nom = st.text_input("Nom")
-                role = st.selectbox("Rôle", ["superviseur", "receptionniste", "concierge"])
-            with col2:
-                if role == "receptionniste":
-                    type_contrat = st.selectbox("Type de contrat", ["temps_plein", "mi_temps_4j", "mi_temps_3j", "nuit"])
-                else:
-                    type_contrat = st.selectbox("Type de contrat", ["temps_plein"])
-                
-                competences_base = {
-                    "superviseur": ["Management", "Accueil", "Anglais", "Formation"],
-                    "receptionniste": ["Accueil", "Anglais"],
-                    "concierge": ["Conciergerie", "Anglais", "Tourisme"]
-                }
-                
-                # Liste des compétences de base + langues communes
-                competences_disponibles = [
-                    "Accueil", "Anglais", "Management", "Conciergerie", "Tourisme", "Sécurité", "Formation",
-                    "Français", "Espagnol", "Italien", "Allemand", "Portugais", "Russe", "Chinois", 
-                    "Japonais", "Arabe", "Hindi", "Néerlandais", "Suédois", "Norvégien", "Danois"
-                ]
-                
-                # Gestion des langues personnalisées
-                if 'langues_personnalisees' not in st.session_state:
-                    st.session_state.langues_personnalisees = []
-                
-                # Toutes les compétences disponibles (base + personnalisées)
-                toutes_competences = competences_disponibles + st.session_state.langues_personnalisees
-                
-                # Interface pour ajouter une langue personnalisée
-                col_lang1, col_lang2 = st.columns([3, 1])
-                with col_lang1:
-                    nouvelle_langue = st.text_input("Ajouter une langue", placeholder="Ex: Coréen, Thaï, Swahili...", key="new_language")
-                with col_lang2:
-                    if st.button("➕ Ajouter", key="add_language"):
-                        if nouvelle_langue and nouvelle_langue not in toutes_competences:
-                            st.session_state.langues_personnalisees.append(nouvelle_langue)
-                            toutes_competences.append(nouvelle_langue)
-                            st.success(f"✅ Langue '{nouvelle_langue}' ajoutée")
-                            st.rerun()
-                        elif nouvelle_langue in toutes_competences:
-                            st.warning("Cette langue existe déjà")
-                        else:
-                            st.warning("Veuillez saisir une langue")
-                
-                # Affichage des langues personnalisées ajoutées
-                if st.session_state.langues_personnalisees:
-                    st.write("**Langues ajoutées :** " + ", ".join(st.session_state.langues_personnalisees))
-                    if st.button("🗑️ Effacer toutes les langues ajoutées", key="clear_languages"):
-                        st.session_state.langues_personnalisees = []
-                        st.success("✅ Langues personnalisées effacées")
+        # Actions de groupe : un seul couple radio + bouton, donc un seul
+        # widget déclencheur et un seul rerun quel que soit le mode choisi
+        st.markdown("---")
+        st.markdown("**Actions rapides sur l'équipe :**")
+
+        col_mode, col_appliquer = st.columns([3, 1])
+        with col_mode:
+            mode_equipe = st.radio("Mode d'équipe", _MODES_EQUIPE, horizontal=True,
+                                   key="team_mode", label_visibility="collapsed")
+        with col_appliquer:
+            if st.button("Appliquer", key="apply_team_mode"):
+                message = _appliquer_mode_equipe(system, mode_equipe)
+                st.success(message) if mode_equipe == _MODES_EQUIPE[0] else st.info(message)
+                st.rerun()
+
+    with st.expander("➕ Ajouter un Employé"):
+        col1, col2 = st.columns(2)
+        with col1:
+            prenom = st.text_input("Prénom")
+            nom = st.text_input("Nom")
+            role = st.selectbox("Rôle", ["superviseur", "receptionniste", "concierge"])
+        with col2:
+            if role == "receptionniste":
+                type_contrat = st.selectbox("Type de contrat", ["temps_plein", "mi_temps_4j", "mi_temps_3j", "nuit"])
+            else:
+                type_contrat = st.selectbox("Type de contrat", ["temps_plein"])
+
+            # Toutes les compétences disponibles (base + personnalisées triées)
+            toutes_competences = [*_COMPETENCES_DISPONIBLES, *sorted(st.session_state.langues_personnalisees)]
+
+            # Interface pour ajouter une langue personnalisée
+            col_lang1, col_lang2 = st.columns([3, 1])
+            with col_lang1:
+                nouvelle_langue = st.text_input("Ajouter une langue", placeholder="Ex: Coréen, Thaï, Swahili...", key="new_language")
+            with col_lang2:
+                if st.button("➕ Ajouter", key="add_language"):
+                    deja_connue = (nouvelle_langue in _COMPETENCES_DISPONIBLES_SET
+                                   or nouvelle_langue in st.session_state.langues_personnalisees)
+                    if nouvelle_langue and not deja_connue:
+                        st.session_state.langues_personnalisees.add(nouvelle_langue)
+                        st.success(f"✅ Langue '{nouvelle_langue}' ajoutée")
                         st.rerun()
-                
-                competences = st.multiselect("Compétences", 
-                    toutes_competences,
-                    default=competences_base.get(role, ["Accueil", "Anglais"]))
+                    elif deja_connue:
+                        st.warning("Cette langue existe déjà")
+                    else:
+                        st.warning("Veuillez saisir une langue")
 
-            if st.button("Ajouter cet Employé"):
-                if prenom and nom:
+            # Affichage des langues personnalisées ajoutées
+            if st.session_state.langues_personnalisees:
+                st.write("**Langues ajoutées :** " + ", ".join(sorted(st.session_state.langues_personnalisees)))
+                if st.button("🗑️ Effacer toutes les langues ajoutées", key="clear_languages"):
+                    st.session_state.langues_personnalisees = set()
+                    st.success("✅ Langues personnalisées effacées")
+                    st.rerun()
+
+            competences = st.multiselect("Compétences", 
+                toutes_competences,
+                default=_COMPETENCES_PAR_ROLE.get(role, _COMPETENCES_RECEPTION))
+
+        if st.button("Ajouter cet Employé"):
+            if prenom and nom:
+                try:
                     system.ajouter_employe(Employee(
                         prenom, nom, type_contrat, 0, role, {}, competences, True, "", 0
                     ))
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                else:
                     st.success(f"✅ Employé {prenom} {nom} ajouté avec succès!")
                     st.rerun()
-                else:
-                    st.error("Veuillez remplir le prénom et le nom")
+            else:
+                st.error("Veuillez remplir le prénom et le nom")
 
-        if system.employees:
-            with st.expander("✏️ Modifier un Employé"):
-                # Sélection de l'employé à modifier
-                employes_options = [f"{e.prenom} {e.nom} ({e.role})" for e in system.employees]
-                employe_a_modifier = st.selectbox("Choisir l'employé à modifier", options=employes_options, key="modify_select")
-                
-                if employe_a_modifier:
-                    # Trouver l'employé sélectionné
-                    prenom_nom_role = employe_a_modifier.split(' (')[0]
-                    parts = prenom_nom_role.split(' ')
-                    if len(parts) >= 2:
-                        prenom_actuel = parts[0]
-                        nom_actuel = ' '.join(parts[1:])
-                    else:
-                        prenom_actuel = parts[0]
-                        nom_actuel = ""
-                    
-                    # Trouver l'objet employé
-                    employe_obj = None
-                    for emp in system.employees:
-                        if emp.prenom == prenom_actuel and emp.nom == nom_actuel:
-                            employe_obj = emp
-                            break
-                    
-                    if employe_obj:
-                        st.write(f"**Modification de** : {employe_obj.prenom} {employe_obj.nom} ({employe_obj.role})")
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            nouveau_prenom = st.text_input("Nouveau prénom", value=employe_obj.prenom, key="new_prenom")
-                            nouveau_nom = st.text_input("Nouveau nom", value=employe_obj.nom, key="new_nom")
-                        
-                        with col2:
-                            # Affichage du rôle et contrat actuels (non modifiables pour conserver la cohérence)
-                            st.text_input("Rôle", value=employe_obj.role.title(), disabled=True, key="role_display")
-                            st.text_input("Contrat", value=employe_obj.type_contrat.replace('_', ' ').title(), disabled=True, key="contrat_display")
-                            
-                            # Compétences modifiables avec langues personnalisées
-                            if 'langues_personnalisees' not in st.session_state:
-                                st.session_state.langues_personnalisees = []
-                            
-                            competences_disponibles = [
-                                "Accueil", "Anglais", "Management", "Conciergerie", "Tourisme", "Sécurité", "Formation",
-                                "Français", "Espagnol", "Italien", "Allemand", "Portugais", "Russe", "Chinois", 
-                                "Japonais", "Arabe", "Hindi", "Néerlandais", "Suédois", "Norvégien", "Danois"
-                            ]
-                            toutes_competences = competences_disponibles + st.session_state.langues_personnalisees
-                            
-                            nouvelles_competences = st.multiselect(
-                                "Compétences", 
-                                toutes_competences,
-                                default=employe_obj.competences,
-                                key="new_competences"
-                            )
-                        
-                        col_btn1, col_btn2 = st.columns(2)
-                        with col_btn1:
-                            if st.button("💾 Sauvegarder les modifications", type="primary", key="save_changes"):
-                                if nouveau_prenom and nouveau_nom:
-                                    # Mettre à jour l'employé
-                                    employe_obj.prenom = nouveau_prenom
-                                    employe_obj.nom = nouveau_nom
-                                    employe_obj.competences = nouvelles_competences
+    if system.employees:
+        with st.expander("✏️ Modifier un Employé"):
+            # Sélection de l'employé à modifier
+            idx_modif = st.selectbox(
+                "Choisir l'employé à modifier", options=range(len(system.employees)),
+                format_func=libelles_equipe.__getitem__, key="modify_select")
+
+            if idx_modif is not None:
+                employe_obj = system.employees[idx_modif]
+
+                if employe_obj:
+                    st.write(f"**Modification de** : {employe_obj.prenom} {employe_obj.nom} ({employe_obj.role})")
+
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        nouveau_prenom = st.text_input("Nouveau prénom", value=employe_obj.prenom, key="new_prenom")
+                        nouveau_nom = st.text_input("Nouveau nom", value=employe_obj.nom, key="new_nom")
+
+                    with col2:
+                        # Affichage du rôle et contrat actuels (non modifiables pour conserver la cohérence)
+                        st.text_input("Rôle", value=_libelle_role(employe_obj.role), disabled=True, key="role_display")
+                        st.text_input("Contrat", value=_libelle_contrat(employe_obj.type_contrat), disabled=True, key="contrat_display")
+
+                        # Compétences modifiables avec langues personnalisées
+                        toutes_competences = [*_COMPETENCES_DISPONIBLES, *sorted(st.session_state.langues_personnalisees)]
+
+                        nouvelles_competences = st.multiselect(
+                            "Compétences", 
+                            toutes_competences,
+                            default=employe_obj.competences,
+                            key="new_competences"
+                        )
+
+                    col_btn1, col_btn2 = st.columns(2)
+                    with col_btn1:
+                        if st.button("💾 Sauvegarder les modifications", type="primary", key="save_changes"):
+                            if nouveau_prenom and nouveau_nom:
+                                try:
+                                    # Passe par le système : refuse un prénom
+                                    # déjà pris et resynchronise l'index
+                                    system.renommer_employe(idx_modif, nouveau_prenom, nouveau_nom)
+                                except ValueError as e:
+                                    st.error(f"❌ {e}")
+                                else:
+                                    # Tuple : garde competences hashable pour
+                                    # les caches (empreintes d'équipe)
+                                    employe_obj.competences = tuple(nouvelles_competences)
                                     st.success(f"✅ Employé modifié avec succès : {nouveau_prenom} {nouveau_nom}")
                                     st.rerun()
-                                else:
-                                    st.error("Veuillez remplir le prénom et le nom")
-                        
-                        with col_btn2:
-                            if st.button("🔄 Annuler", key="cancel_changes"):
-                                st.info("Modifications annulées")
-                                st.rerun()
-
-        if system.employees:
-            with st.expander("🗑️ Supprimer un Employé"):
-                noms = [f"{e.prenom} {e.nom} ({e.role})" for e in system.employees]
-                to_delete = st.selectbox("Choisir l'employé à supprimer", options=noms)
-                if st.button("Confirmer la suppression", type="secondary"):
-                    prenom_nom = to_delete.split(' (')[0]
-                    prenom, nom = prenom_nom.split(' ', 1)
-                    system.supprimer_employe(prenom, nom)
-                    st.success(f"✅ {to_delete} supprimé avec succès!")
-                    st.rerun()
+                            else:
+                                st.error("Veuillez remplir le prénom et le nom")
 
-        with st.expander("🌍 Gestion des Langues"):
-            st.markdown("**Langues disponibles dans l'équipe :**")
-            
-            # Initialisation si nécessaire
-            if 'langues_personnalisees' not in st.session_state:
-                st.session_state.langues_personnalisees = []
-            
-            # Collecte de toutes les langues utilisées par l'équipe
-            langues_utilisees = set()
-            for emp in system.employees:
-                for competence in emp.competences:
-                    # Identifier les langues (compétences qui ne sont pas techniques)
-                    langues_courantes = ["Anglais", "Français", "Espagnol", "Italien", "Allemand", "Portugais", 
-                                       "Russe", "Chinois", "Japonais", "Arabe", "Hindi", "Néerlandais", 
-                                       "Suédois", "Norvégien", "Danois"] + st.session_state.langues_personnalisees
-                    if competence in langues_courantes:
-                        langues_utilisees.add(competence)
-            
-            if langues_utilisees:
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write("**Langues parlées dans l'équipe :**")
-                    for langue in sorted(langues_utilisees):
-                        # Compter combien d'employés parlent cette langue
-                        nb_locuteurs = sum(1 for emp in system.employees if langue in emp.competences)
-                        st.write(f"🗣️ {langue}: {nb_locuteurs} personne(s)")
-                
-                with col2:
-                    st.write("**Statistiques linguistiques :**")
-                    st.metric("Langues différentes", len(langues_utilisees))
-                    
-                    # Langue la plus parlée
-                    if langues_utilisees:
-                        langue_counts = {}
-                        for langue in langues_utilisees:
-                            langue_counts[langue] = sum(1 for emp in system.employees if langue in emp.competences)
-                        langue_principale = max(langue_counts, key=langue_counts.get)
-                        st.metric("Langue principale", f"{langue_principale} ({langue_counts[langue_principale]} pers.)")
-            else:
-                st.info("Aucune langue spécifique détectée dans l'équipe")
-            
-            # Gestion des langues personnalisées
-            st.markdown("---")
-            st.markdown("**Ajouter de nouvelles langues :**")
-            
-            col_add1, col_add2, col_add3 = st.columns([2, 1, 1])
-            with col_add1:
-                nouvelle_langue_equipe = st.text_input(
-                    "Nouvelle langue", 
-                    placeholder="Ex: Coréen, Thaï, Bengali...", 
-                    key="new_team_language"
-                )
-            with col_add2:
-                if st.button("➕ Ajouter", key="add_team_language"):
-                    if nouvelle_langue_equipe and nouvelle_langue_equipe not in st.session_state.langues_personnalisees:
-                        langues_existantes = ["Anglais", "Français", "Espagnol", "Italien", "Allemand", "Portugais", 
-                                            "Russe", "Chinois", "Japonais", "Arabe", "Hindi", "Néerlandais", 
-                                            "Suédois", "Norvégien", "Danois"]
-                        if nouvelle_langue_equipe not in langues_existantes:
-                            st.session_state.langues_personnalisees.append(nouvelle_langue_equipe)
-                            st.success(f"✅ Langue '{nouvelle_langue_equipe}' ajoutée")
+                    with col_btn2:
+                        if st.button("🔄 Annuler", key="cancel_changes"):
+                            st.info("Modifications annulées")
                             st.rerun()
-                        else:
-                            st.warning("Cette langue existe déjà dans la liste de base")
-                    elif nouvelle_langue_equipe in st.session_state.langues_personnalisees:
-                        st.warning("Cette langue a déjà été ajoutée")
-                    else:
-                        st.warning("Veuillez saisir une langue")
-            
-            with col_add3:
-                if st.session_state.langues_personnalisees and st.button("🗑️ Effacer", key="clear_team_languages"):
-                    st.session_state.langues_personnalisees = []
-                    st.success("✅ Langues personnalisées effacées")
-                    st.rerun()
-            
-            # Affichage des langues personnalisées
-            if st.session_state.langues_personnalisees:
-                st.write("**Langues ajoutées :** " + ", ".join(st.session_state.langues_personnalisees))
 
-        with st.expander("🔧 Gestion Avancée de l'Équipe"):
-            st.markdown("**Actions rapides sur l'équipe :**")
-            
-            col1, col2, col3 = st.columns(3)
-            
+    if system.employees:
+        with st.expander("🗑️ Supprimer un Employé"):
+            idx_suppr = st.selectbox(
+                "Choisir l'employé à supprimer", options=range(len(system.employees)),
+                format_func=libelles_equipe.__getitem__)
+            if st.button("Confirmer la suppression", type="secondary"):
+                employe = system.employees[idx_suppr]
+                system.supprimer_employe(employe.prenom, employe.nom)
+                st.success(f"✅ {libelles_equipe[idx_suppr]} supprimé avec succès!")
+                st.rerun()
+
+    with st.expander("🌍 Gestion des Langues"):
+        st.markdown("**Langues disponibles dans l'équipe :**")
+
+        # Comptage des locuteurs par langue : une seule passe sur l'équipe
+        langues_reconnues = _LANGUES_BASE_SET.union(st.session_state.langues_personnalisees)
+        compteur_langues = Counter(
+            competence
+            for emp in system.employees
+            for competence in emp.competences
+            if competence in langues_reconnues
+        )
+
+        if compteur_langues:
+            col1, col2 = st.columns(2)
             with col1:
-                if st.button("🔄 Réinitialiser l'équipe par défaut", key="reset_team"):
-                    system.employees.clear()
-                    initialiser_equipe_conforme(system)
-                    st.success("✅ Équipe réinitialisée avec la configuration par défaut")
-                    st.rerun()
-            
+                # Un seul élément markdown pour toute la liste, plutôt qu'un
+                # message Streamlit par langue
+                st.markdown("**Langues parlées dans l'équipe :**\n" + "\n".join(
+                    f"- 🗣️ {langue}: {compteur_langues[langue]} personne(s)"
+                    for langue in sorted(compteur_langues)
+                ))
+
             with col2:
-                if st.button("🏥 Absences partielles", key="partial_absences"):
-                    # Simule des absences partielles réalistes
-                    import random
-                    absences_scenarios = [
-                        ("Maladie", 1, 2),  # 1-2 jours
-                        ("RTT", 1, 1),      # 1 jour
-                        ("Rendez-vous médical", 1, 1),  # 1 jour
-                        ("Formation", 2, 3),  # 2-3 jours
-                        ("Congés payés", 2, 4)  # 2-4 jours
-                    ]
-                    
-                    affected_count = 0
-                    for emp in system.employees:
-                        if emp.role != 'superviseur' and random.random() < 0.4:  # 40% de chance
-                            motif, min_days, max_days = random.choice(absences_scenarios)
-                            jours_absence = min(random.randint(min_days, max_days), emp.jours_semaine - 1)
-                            if jours_absence > 0:
-                                emp.disponible = True
-                                emp.jours_absence = jours_absence
-                                emp.motif_indisponibilite = motif
-                                affected_count += 1
-                    
-                    st.info(f"ℹ️ {affected_count} employé(s) avec absences partielles simulées")
-                    st.rerun()
+                st.write("**Statistiques linguistiques :**")
+                st.metric("Langues différentes", len(compteur_langues))
 
-            with col3:
-                if st.button("📊 Scénario réaliste", key="realistic_scenario"):
-                    # Scénario réaliste d'un front office
-                    scenarios = {
-                        "Superviseur1": (True, 0, ""),
-                        "Superviseur2": (True, 1, "RTT"),  # 1 jour RTT
-                        "Superviseur3": (True, 0, ""),
-                        "Recep1": (True, 2, "Congés payés"),  # 2 jours congés
-                        "Recep2": (False, 7, "Maladie"),  # Complètement malade
-                        "Recep3": (True, 1, "Rendez-vous médical"),  # 1 jour RDV
-                        "Night1": (True, 0, ""),
-                        "Night2": (True, 1, "Formation"),  # 1 jour formation
-                        "Night3": (True, 0, ""),
-                        "Concierge": (True, 3, "Congés payés")  # 3 jours congés
-                    }
-                    
-                    for emp in system.employees:
-                        if emp.prenom in scenarios:
-                            disponible, jours_abs, motif = scenarios[emp.prenom]
-                            emp.disponible = disponible
-                            emp.jours_absence = jours_abs if disponible else 7
-                            emp.motif_indisponibilite = motif
-                    
-                    st.info("ℹ️ Scénario réaliste appliqué (mix d'absences)")
-                    st.rerun()
-                # Compteur d'employés par type
-                nb_superviseurs = len([e for e in system.employees if e.role == 'superviseur'])
-                nb_recep_jour = len([e for e in system.employees if e.role == 'receptionniste' and e.type_contrat != 'nuit'])
-                nb_recep_nuit = len([e for e in system.employees if e.role == 'receptionniste' and e.type_contrat == 'nuit'])
-                nb_concierges = len([e for e in system.employees if e.role == 'concierge'])
-                
-                st.write("**Composition actuelle :**")
-                st.write(f"👨‍💼 Superviseurs: {nb_superviseurs}")
-                st.write(f"👨‍💻 Réceptionnistes jour: {nb_recep_jour}")
-                st.write(f"🌙 Réceptionnistes nuit: {nb_recep_nuit}")
-                st.write(f"🛎️ Concierges: {nb_concierges}")
+                # Langue la plus parlée
+                langue_principale, nb_locuteurs = compteur_langues.most_common(1)[0]
+                st.metric("Langue principale", f"{langue_principale} ({nb_locuteurs} pers.)")
+        else:
+            st.info("Aucune langue spécifique détectée dans l'équipe")
 
-    # === TAB 2: Prévisions ===
-    with tab2:
-        st.header("📊 Prévisions de Check-ins et Check-outs")
-        
-        # Initialisation des données par défaut
-        if 'checkins' not in st.session_state:
-            st.session_state.checkins = {
-                'Lundi': 180, 'Mardi': 150, 'Mercredi': 200, 'Jeudi': 220,
-                'Vendredi': 250, 'Samedi': 300, 'Dimanche': 280
-            }
-        if 'checkouts' not in st.session_state:
-            st.session_state.checkouts = {
-                'Lundi': 280, 'Mardi': 300, 'Mercredi': 250, 'Jeudi': 220,
-                'Vendredi': 200, 'Samedi': 150, 'Dimanche': 180
-            }
+        # Gestion des langues personnalisées
+        st.markdown("---")
+        st.markdown("**Ajouter de nouvelles langues :**")
+
+        col_add1, col_add2, col_add3 = st.columns([2, 1, 1])
+        with col_add1:
+            nouvelle_langue_equipe = st.text_input(
+                "Nouvelle langue", 
+                placeholder="Ex: Coréen, Thaï, Bengali...", 
+                key="new_team_language"
+            )
+        with col_add2:
+            if st.button("➕ Ajouter", key="add_team_language"):
+                if nouvelle_langue_equipe and nouvelle_langue_equipe not in st.session_state.langues_personnalisees:
+                    if nouvelle_langue_equipe not in _LANGUES_BASE_SET:
+                        st.session_state.langues_personnalisees.add(nouvelle_langue_equipe)
+                        st.success(f"✅ Langue '{nouvelle_langue_equipe}' ajoutée")
+                        st.rerun()
+                    else:
+                        st.warning("Cette langue existe déjà dans la liste de base")
+                elif nouvelle_langue_equipe in st.session_state.langues_personnalisees:
+                    st.warning("Cette langue a déjà été ajoutée")
+                else:
+                    st.warning("Veuillez saisir une langue")
 
-        # Boutons de présets
-        st.subheader("🎯 Présets d'occupation")
-        cols = st.columns(4)
-        with cols[0]:
-            if st.button("📈 Haute saison"):
-                for jour in system.jours_semaine:
-                    st.session_state.checkins[jour] = np.random.randint(250, 350)
-                    st.session_state.checkouts[jour] = np.random.randint(250, 350)
-                st.rerun()
-        with cols[1]:
-            if st.button("📊 Saison moyenne"):
-                for jour in system.jours_semaine:
-                    st.session_state.checkins[jour] = np.random.randint(150, 250)
-                    st.session_state.checkouts[jour] = np.random.randint(150, 250)
-                st.rerun()
-        with cols[2]:
-            if st.button("📉 Basse saison"):
-                for jour in system.jours_semaine:
-                    st.session_state.checkins[jour] = np.random.randint(50, 150)
-                    st.session_state.checkouts[jour] = np.random.randint(50, 150)
-                st.rerun()
-        with cols[3]:
-            if st.button("🔄 Réinitialiser"):
-                st.session_state.checkins = {j: 200 for j in system.jours_semaine}
-                st.session_state.checkouts = {j: 200 for j in system.jours_semaine}
+        with col_add3:
+            if st.session_state.langues_personnalisees and st.button("🗑️ Effacer", key="clear_team_languages"):
+                st.session_state.langues_personnalisees = set()
+                st.success("✅ Langues personnalisées effacées")
                 st.rerun()
 
-        # Saisie des données
-        col1, col2 = st.columns(2)
-        with col1:
-            st.subheader("🌅 Check-outs (matin 7h-15h)")
-            for jour in system.jours_semaine:
-                st.session_state.checkouts[jour] = st.number_input(
-                    f"{jour}", 0, 500, st.session_state.checkouts[jour], 
-                    key=f"checkout_{jour}", help=f"Nombre de départs le {jour} matin"
-                )
-        
-        with col2:
-            st.subheader("🌆 Check-ins (après-midi 15h-23h)")
-            for jour in system.jours_semaine:
-                st.session_state.checkins[jour] = st.number_input(
-                    f"{jour}", 0, 500, st.session_state.checkins[jour], 
-                    key=f"checkin_{jour}", help=f"Nombre d'arrivées le {jour} après-midi"
-                )
+        # Affichage des langues personnalisées
+        if st.session_state.langues_personnalisees:
+            st.write("**Langues ajoutées :** " + ", ".join(sorted(st.session_state.langues_personnalisees)))
 
-        # Calcul des besoins
-        if st.button("🧮 Calculer les Besoins en Personnel", type="primary"):
-            besoins = system.calculer_besoins_personnel(st.session_state.checkins, st.session_state.checkouts)
-            st.session_state.besoins = besoins
-            
-            st.subheader("📋 Besoins Calculés")
-            
-            # Tableau des besoins
-            data_besoins = []
-            for jour, shifts in besoins.items():
-                for shift, infos in shifts.items():
-                    if shift == 'nuit':
-                        data_besoins.append({
-                            'Jour': jour,
-                            'Période': shift.replace('_', ' ').title(),
-                            'Personnel Total': infos['receptionists'],
-                            'Min Superviseurs': infos['superviseurs'],
-                            'Concierge': infos['concierge']
-                        })
-                    else:
-                        data_besoins.append({
-                            'Jour': jour,
-                            'Période': shift.replace('_', ' ').title(),
-                            'Personnel Total': infos['total_personnel'],
-                            'Min Superviseurs': infos['min_superviseurs'],
-                            'Concierge': infos['concierge']
-                        })
-            
-            df_besoins = pd.DataFrame(data_besoins)
-            st.dataframe(df_besoins, use_container_width=True)
-            
-            # Graphique
-            fig = px.bar(df_besoins, x='Jour', y=['Personnel Total', 'Min Superviseurs', 'Concierge'], 
-                        color='Période', barmode='group',
-                        title="Besoins en Personnel par Jour et Période")
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Résumé
-            total_postes = sum(data['Personnel Total'] for data in data_besoins if data['Personnel Total'])
-            st.info(f"📊 **Résumé**: {total_postes} postes à pourvoir sur la semaine (hors concierge)")
+    with st.expander("🔧 Gestion Avancée de l'Équipe"):
+        st.markdown("**Actions rapides sur l'équipe :**")
 
-    # === TAB 3: Planning ===
-    with tab3:
-        st.header("📅 Génération du Planning")
-        
-        # Vérifications préalables avec nouvelles conditions
         col1, col2, col3 = st.columns(3)
+
         with col1:
-            besoins_ok = 'besoins' in st.session_state
-            st.write("✅ Besoins calculés" if besoins_ok else "❌ Calculez d'abord les besoins")
+            if st.button("🔄 Réinitialiser l'équipe par défaut", key="reset_team"):
+                system.employees.clear()
+                initialiser_equipe_conforme(system)
+                st.success("✅ Équipe réinitialisée avec la configuration par défaut")
+                st.rerun()
+
         with col2:
-            employes_disponibles = len([e for e in system.employees if e.disponible])
-            equipe_ok = employes_disponibles >= 5  # Minimum viable
-            st.write(f"✅ Équipe disponible ({employes_disponibles} pers.)" if equipe_ok else f"❌ Équipe insuffisante ({employes_disponibles} pers.)")
+            if st.button("🏥 Absences partielles", key="partial_absences"):
+                # Simule des absences partielles réalistes : tous les tirages
+                # sont faits d'avance en trois appels NumPy vectorisés, la
+                # boucle ne fait plus qu'affecter les attributs
+                non_superviseurs = [e for e in system.employees if e.role != 'superviseur']
+                touches = np.random.random(len(non_superviseurs)) < 0.4  # 40% de chance
+                scenarios_tires = np.random.randint(0, len(_SCENARIOS_ABSENCES), len(non_superviseurs))
+                bornes_min = np.array([s[1] for s in _SCENARIOS_ABSENCES])
+                bornes_max = np.array([s[2] for s in _SCENARIOS_ABSENCES])
+                jours_tires = np.random.randint(bornes_min[scenarios_tires], bornes_max[scenarios_tires] + 1)
+
+                affected_count = 0
+                for emp, touche, i_scenario, jours in zip(non_superviseurs, touches, scenarios_tires, jours_tires):
+                    if touche:
+                        jours_absence = min(int(jours), emp.jours_semaine - 1)
+                        if jours_absence > 0:
+                            emp.disponible = True
+                            emp.jours_absence = jours_absence
+                            emp.motif_indisponibilite = _SCENARIOS_ABSENCES[i_scenario][0]
+                            affected_count += 1
+
+                st.info(f"ℹ️ {affected_count} employé(s) avec absences partielles simulées")
+                st.rerun()
+
         with col3:
-            faisable = st.session_state.get('faisabilite', {}).get('faisable', True)
-            st.write("✅ Planning réalisable" if faisable else "❌ Planning impossible")
-
-        if not besoins_ok:
-            st.warning("⚠️ Calculez d'abord les besoins dans l'onglet 📊 Occupation.")
-        elif not equipe_ok:
-            st.error("⚠️ Équipe insuffisante. Il faut au minimum 5 personnes disponibles pour générer un planning.")
-            st.info("💡 **Solutions** : Rendez plus d'employés disponibles dans l'onglet 👥 Équipe > Gestion des Disponibilités")
-        elif not faisable:
-            st.error("⚠️ Planning impossible avec l'équipe disponible. Consultez les problèmes dans l'onglet 📊 Occupation.")
-            st.info("💡 **Solutions** : Réduisez l'occupation prévue ou augmentez l'équipe disponible")
-        else:
-            # Date de début de semaine
-            semaine_debut = st.date_input(
-                "📅 Date de début de semaine (lundi)",
-                value=datetime.now().date(),
-                help="Sélectionnez le lundi de la semaine à planifier"
-            )
-            
-            if st.button("✨ Générer le Planning Optimisé", type="primary"):
-                with st.spinner("🔄 Génération du planning en cours..."):
-                    try:
-                        planning = system.generer_planning_optimise(
-                            st.session_state.checkins,
-                            st.session_state.checkouts,
-                            datetime.combine(semaine_debut, datetime.min.time())
-                        )
-                        
-                        if planning:
-                            st.session_state.planning = planning
-                            st.session_state.semaine_debut = semaine_debut
-                            st.success("✅ Planning généré avec succès!")
-                        else:
-                            st.error("❌ Impossible de générer un planning valide avec les contraintes actuelles.")
-                    except Exception as e:
-                        st.error(f"❌ Erreur lors de la génération: {str(e)}")
-
-            # Affichage du planning
-            if 'planning' in st.session_state and st.session_state.planning:
-                st.subheader("📋 Planning Hebdomadaire Généré")
-                
-                # Calcul des dates de la semaine
-                dates_semaine = []
-                for i, jour in enumerate(system.jours_semaine):
-                    date_jour = semaine_debut + timedelta(days=i)
-                    dates_semaine.append(date_jour.strftime('%d/%m'))
-                
-                # Création du tableau planning avec sous-colonnes
-                planning_data = []
-                for emp in system.employees:
-                    row = {
-                        'Employé': f"{emp.prenom} {emp.nom}",
-                        'Rôle': emp.role.title(),
-                        'Contrat': emp.type_contrat.replace('_', ' ').title()
-                    }
-                    
-                    # Pour chaque jour, créer 3 sous-colonnes (matin/après-midi/nuit)
-                    for i, jour in enumerate(system.jours_semaine):
-                        date_str = dates_semaine[i]
-                        
-                        # Matin
-                        if any(e['prenom'] == emp.prenom for e in st.session_state.planning[jour]['matin']):
-                            row[f"{jour} {date_str} - Matin"] = "🌅 M"
-                        else:
-                            row[f"{jour} {date_str} - Matin"] = ""
-                        
-                        # Après-midi
-                        if any(e['prenom'] == emp.prenom for e in st.session_state.planning[jour]['apres_midi']):
-                            row[f"{jour} {date_str} - AM"] = "🌆 AM"
-                        else:
-                            row[f"{jour} {date_str} - AM"] = ""
-                        
-                        # Nuit
-                        if any(e['prenom'] == emp.prenom for e in st.session_state.planning[jour]['nuit']):
-                            row[f"{jour} {date_str} - Nuit"] = "🌙 N"
-                        else:
-                            row[f"{jour} {date_str} - Nuit"] = ""
-                    
-                    planning_data.append(row)
-                
-                # Affichage du tableau
-                df_planning = pd.DataFrame(planning_data)
-                
-                # Style du tableau avec mise en forme conditionnelle
-                def style_planning(val):
-                    if "🌅 M" in str(val):
-                        return 'background-color: #FFFFCC; color: #000000; font-weight: bold; text-align: center'
-                    elif "🌆 AM" in str(val):
-                        return 'background-color: #FFCCFF; color: #000000; font-weight: bold; text-align: center'
-                    elif "🌙 N" in str(val):
-                        return 'background-color: #CCCCFF; color: #000000; font-weight: bold; text-align: center'
-                    else:
-                        return 'background-color: #F9F9F9; text-align: center'
-                
-                # Colonnes des shifts (exclure les 3 premières colonnes d'info)
-                shift_columns = [col for col in df_planning.columns if any(jour in col for jour in system.jours_semaine)]
-                
-                # Application du style
-                styled_df = df_planning.style.applymap(style_planning, subset=shift_columns)
-                
-                # Affichage du tableau stylé
-                st.dataframe(styled_df, use_container_width=True, height=600)
-                
-                # Résumé par shift et validation
-                st.subheader("📊 Validation du Planning")
-                
-                validation_data = []
-                for i, jour in enumerate(system.jours_semaine):
-                    date_str = dates_semaine[i]
-                    for shift in ['matin', 'apres_midi', 'nuit']:
-                        equipe = st.session_state.planning[jour][shift]
-                        nb_superviseurs = len([e for e in equipe if e['role'] == 'superviseur'])
-                        nb_receptionnistes = len([e for e in equipe if e['role'] == 'receptionniste'])
-                        nb_concierges = len([e for e in equipe if e['role'] == 'concierge'])
-                        total = len(equipe)
-                        
-                        # Validation des règles
-                        validation_ok = True
-                        problemes = []
-                        
-                        if shift == 'nuit':
-                            if nb_receptionnistes != 2:
-                                validation_ok = False
-                                problemes.append(f"Doit avoir 2 réceptionnistes (a {nb_receptionnistes})")
-                            if nb_superviseurs > 0:
-                                validation_ok = False
-                                problemes.append("Superviseurs interdits la nuit")
-                            if nb_concierges > 0:
-                                validation_ok = False
-                                problemes.append("Concierge interdit la nuit")
-                        else:
-                            if nb_superviseurs < 1:
-                                validation_ok = False
-                                problemes.append(f"Doit avoir au moins 1 superviseur (a {nb_superviseurs})")
-                            if total > 4:
-                                validation_ok = False
-                                problemes.append(f"Maximum 4 personnes (a {total})")
-                            if jour not in ['Samedi', 'Dimanche'] and shift == 'matin' and nb_concierges != 1:
-                                validation_ok = False
-                                problemes.append(f"Concierge obligatoire en semaine le matin (a {nb_concierges})")
-                            if jour in ['Samedi', 'Dimanche'] and nb_concierges > 0:
-                                validation_ok = False
-                                problemes.append("Concierge interdit le weekend")
-                            if shift == 'apres_midi' and nb_concierges > 0:
-                                validation_ok = False
-                                problemes.append("Concierge interdit l'après-midi")
-                        
-                        validation_data.append({
-                            'Jour': f"{jour} {date_str}",
-                            'Shift': shift.replace('_', ' ').title(),
-                            'Total': total,
-                            'Superviseurs': nb_superviseurs,
-                            'Réceptionnistes': nb_receptionnistes,
-                            'Concierge': nb_concierges,
-                            'Statut': '✅ OK' if validation_ok else '❌ Problème',
-                            'Détails': ', '.join(problemes) if problemes else 'Conforme'
+            if st.button("📊 Scénario réaliste", key="realistic_scenario"):
+                # Scénario réaliste d'un front office
+                scenarios = {
+                    "Superviseur1": (True, 0, ""),
+                    "Superviseur2": (True, 1, "RTT"),  # 1 jour RTT
+                    "Superviseur3": (True, 0, ""),
+                    "Recep1": (True, 2, "Congés payés"),  # 2 jours congés
+                    "Recep2": (False, 7, "Maladie"),  # Complètement malade
+                    "Recep3": (True, 1, "Rendez-vous médical"),  # 1 jour RDV
+                    "Night1": (True, 0, ""),
+                    "Night2": (True, 1, "Formation"),  # 1 jour formation
+                    "Night3": (True, 0, ""),
+                    "Concierge": (True, 3, "Congés payés")  # 3 jours congés
+                }
+
+                # Les prénoms sont uniques (garanti par ajouter_employe) : un
+                # index les résout en O(1) et on itère sur les scénarios
+                par_prenom = {e.prenom: e for e in system.employees}
+                for prenom, (disponible, jours_abs, motif) in scenarios.items():
+                    emp = par_prenom.get(prenom)
+                    if emp is not None:
+                        emp.disponible = disponible
+                        emp.jours_absence = jours_abs if disponible else 7
+                        emp.motif_indisponibilite = motif
+
+                st.info("ℹ️ Scénario réaliste appliqué (mix d'absences)")
+                st.rerun()
+            # Compteur d'employés par type (partitions en cache, une passe)
+            superviseurs_eq, recep_jour_eq, recep_nuit_eq, concierges_eq = system._partitions_roles()
+            nb_superviseurs = len(superviseurs_eq)
+            nb_recep_jour = len(recep_jour_eq)
+            nb_recep_nuit = len(recep_nuit_eq)
+            nb_concierges = len(concierges_eq)
+
+            st.write("**Composition actuelle :**")
+            st.write(f"👨‍💼 Superviseurs: {nb_superviseurs}")
+            st.write(f"👨‍💻 Réceptionnistes jour: {nb_recep_jour}")
+            st.write(f"🌙 Réceptionnistes nuit: {nb_recep_nuit}")
+            st.write(f"🛎️ Concierges: {nb_concierges}")
+
+
+@st.cache_data(show_spinner=False)
+def _analyse_cache(_system, _planning, version_planning, empreinte_equipe):
+    """Analyse du planning, mémoïsée entre les onglets et les reruns.
+
+    Le planning (dict imbriqué) et le système sont passés avec un underscore
+    pour être exclus de la clé de cache ; la version de planning, incrémentée
+    à chaque génération réussie, et l'empreinte d'équipe servent de clé.
+    """
+    return _system.analyser_planning(_planning)
+
+
+@st.cache_data(show_spinner=False)
+def _tableau_heures(_analyse, version_planning, empreinte_equipe) -> pd.DataFrame:
+    """Tableau des heures par employé, mémoïsé sur la version du planning.
+
+    Évite de ré-inférer les dtypes du dict d'analyse à chaque rerun de
+    l'onglet ; même clé de cache que l'analyse dont il découle.
+    """
+    df_heures = pd.DataFrame.from_dict(_analyse['heures_par_employe'], orient='index').reset_index()
+    df_heures.rename(columns={'index': 'Employé'}, inplace=True)
+    return df_heures
+
+
+_ICONES_ROLES = {"superviseur": "👨‍💼", "receptionniste": "👨‍💻", "concierge": "🛎️"}
+
+# Libellés, clés et textes d'aide des 14 saisies d'occupation, formatés une
+# seule fois à l'import plutôt qu'à chaque rerun
+_AIDE_CHECKOUTS = {j: f"Nombre de départs le {j} matin" for j in _JOURS}
+_AIDE_CHECKINS = {j: f"Nombre d'arrivées le {j} après-midi" for j in _JOURS}
+_CLES_CHECKOUT = {j: f"checkout_{j}" for j in _JOURS}
+_CLES_CHECKIN = {j: f"checkin_{j}" for j in _JOURS}
+
+
+@st.cache_data(show_spinner=False)
+def _excel_cache(_system, _planning, _analyse, version_planning, empreinte_equipe, semaine_debut):
+    """Octets du classeur Excel, mémoïsés sur la version du planning.
+
+    Recliquer sur le bouton d'export sans avoir regénéré le planning renvoie
+    les octets déjà construits au lieu de reconstruire le classeur.
+    """
+    return _system.exporter_planning_excel(
+        _planning, _analyse, datetime.combine(semaine_debut, datetime.min.time()))
+
+
+@st.cache_data(show_spinner=False)
+def _graphique_besoins(df_besoins: pd.DataFrame):
+    """Graphique des besoins, mémoïsé sur le contenu du tableau.
+
+    La figure Plotly est coûteuse à construire ; la clé de cache est le
+    hachage du DataFrame, donc deux calculs avec la même occupation
+    réutilisent la figure.
+    """
+    import plotly.express as px
+    return px.bar(df_besoins, x='Jour', y=['Personnel Total', 'Min Superviseurs', 'Concierge'],
+                  color='Période', barmode='group',
+                  title="Besoins en Personnel par Jour et Période")
+
+
+@st.cache_data(show_spinner=False)
+def _graphique_heures(df_heures: pd.DataFrame):
+    """Graphique des heures par employé, mémoïsé sur le contenu du tableau"""
+    import plotly.express as px
+    fig_heures = px.bar(df_heures, x='Employé', y='heures', color='role',
+                        title="Répartition des Heures par Employé",
+                        color_discrete_map={
+                            'superviseur': '#FFE6CC',
+                            'receptionniste': '#E6F3FF',
+                            'concierge': '#E6FFE6'
                         })
-                
-                df_validation = pd.DataFrame(validation_data)
-                
-                # Style pour la validation
-                def style_validation(row):
-                    if '❌' in str(row['Statut']):
-                        return ['background-color: #ffcccc'] * len(row)
-                    elif '✅' in str(row['Statut']):
-                        return ['background-color: #ccffcc'] * len(row)
-                    else:
-                        return [''] * len(row)
-                
-                styled_validation = df_validation.style.apply(style_validation, axis=1)
-                st.dataframe(styled_validation, use_container_width=True)
-                
-                # Statistiques de validation
-                problemes_count = len([v for v in validation_data if '❌' in v['Statut']])
-                total_shifts = len(validation_data)
-                
-                if problemes_count == 0:
-                    st.success(f"✅ Planning parfaitement valide ! Tous les {total_shifts} shifts respectent les contraintes.")
+    fig_heures.update_layout(xaxis_tickangle=45)
+    return fig_heures
+
+
+@st.cache_data(show_spinner=False)
+def _graphique_couverture(df_couverture: pd.DataFrame):
+    """Graphique de couverture par shift, mémoïsé sur le contenu du tableau"""
+    import plotly.express as px
+    return px.bar(df_couverture, x='Jour',
+                  y=['superviseurs', 'receptionnistes', 'concierge'],
+                  color='Shift',
+                  title="Composition des Équipes par Shift",
+                  barmode='stack')
+
+
+def _appliquer_saison(jours, bas, haut):
+    """Tire les arrivées/départs d'une saison en deux appels RNG vectorisés"""
+    arrivees = np.random.randint(bas, haut, size=len(jours))
+    departs = np.random.randint(bas, haut, size=len(jours))
+    st.session_state.checkins = dict(zip(jours, map(int, arrivees)))
+    st.session_state.checkouts = dict(zip(jours, map(int, departs)))
+
+
+@st.fragment
+def _onglet_occupation(system):
+    """Onglet Occupation, isolé dans un fragment Streamlit.
+
+    Les saisies et présets ne redessinent que cet onglet ; le calcul
+    des besoins change l'état lu par l'onglet Planning et repasse
+    donc par un rerun complet de l'application.
+    """
+    st.header("📊 Prévisions de Check-ins et Check-outs")
+    
+    # Initialisation des données par défaut
+    if 'checkins' not in st.session_state:
+        st.session_state.checkins = {
+            'Lundi': 180, 'Mardi': 150, 'Mercredi': 200, 'Jeudi': 220,
+            'Vendredi': 250, 'Samedi': 300, 'Dimanche': 280
+        }
+    if 'checkouts' not in st.session_state:
+        st.session_state.checkouts = {
+            'Lundi': 280, 'Mardi': 300, 'Mercredi': 250, 'Jeudi': 220,
+            'Vendredi': 200, 'Samedi': 150, 'Dimanche': 180
+        }
+
+    # Boutons de présets
+    st.subheader("🎯 Présets d'occupation")
+    cols = st.columns(4)
+    with cols[0]:
+        if st.button("📈 Haute saison"):
+            _appliquer_saison(system.jours_semaine, 250, 350)
+            st.rerun()
+    with cols[1]:
+        if st.button("📊 Saison moyenne"):
+            _appliquer_saison(system.jours_semaine, 150, 250)
+            st.rerun()
+    with cols[2]:
+        if st.button("📉 Basse saison"):
+            _appliquer_saison(system.jours_semaine, 50, 150)
+            st.rerun()
+    with cols[3]:
+        if st.button("🔄 Réinitialiser"):
+            st.session_state.checkins = {j: 200 for j in system.jours_semaine}
+            st.session_state.checkouts = {j: 200 for j in system.jours_semaine}
+            st.rerun()
+
+    # Saisie des données
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("🌅 Check-outs (matin 7h-15h)")
+        for jour in system.jours_semaine:
+            st.session_state.checkouts[jour] = st.number_input(
+                jour, 0, 500, st.session_state.checkouts[jour], 
+                key=_CLES_CHECKOUT[jour], help=_AIDE_CHECKOUTS[jour]
+            )
+    
+    with col2:
+        st.subheader("🌆 Check-ins (après-midi 15h-23h)")
+        for jour in system.jours_semaine:
+            st.session_state.checkins[jour] = st.number_input(
+                jour, 0, 500, st.session_state.checkins[jour], 
+                key=_CLES_CHECKIN[jour], help=_AIDE_CHECKINS[jour]
+            )
+
+    # Calcul des besoins : le bouton met à jour l'état global (lu par
+    # l'onglet Planning) puis repasse par un rerun complet ; l'affichage
+    # se fait depuis session_state et survit donc aux reruns
+    if st.button("🧮 Calculer les Besoins en Personnel", type="primary"):
+        st.session_state.besoins = system.calculer_besoins_personnel(
+            st.session_state.checkins, st.session_state.checkouts)
+        st.rerun(scope="app")
+
+    if 'besoins' in st.session_state:
+        st.subheader("📋 Besoins Calculés")
+        
+        # Tableau des besoins
+        data_besoins = []
+        for jour, shifts in st.session_state.besoins.items():
+            for shift, infos in shifts.items():
+                if shift == 'nuit':
+                    data_besoins.append({
+                        'Jour': jour,
+                        'Période': shift.replace('_', ' ').title(),
+                        'Personnel Total': infos['receptionists'],
+                        'Min Superviseurs': infos['superviseurs'],
+                        'Concierge': infos['concierge']
+                    })
                 else:
-                    st.error(f"❌ {problemes_count} problème(s) détecté(s) sur {total_shifts} shifts.")
-                
-                # Vue par équipe pour chaque shift
-                with st.expander("👥 Composition détaillée des équipes"):
-                    for i, jour in enumerate(system.jours_semaine):
-                        date_str = dates_semaine[i]
-                        st.write(f"**{jour} {date_str}:**")
-                        cols = st.columns(3)
-                        
-                        shifts_info = [
-                            ("🌅 Matin", 'matin'),
-                            ("🌆 Après-midi", 'apres_midi'),
-                            ("🌙 Nuit", 'nuit')
-                        ]
-                        
-                        for col, (titre, shift_key) in zip(cols, shifts_info):
-                            with col:
-                                st.write(f"*{titre}:*")
-                                equipe = st.session_state.planning[jour][shift_key]
-                                if equipe:
-                                    for e in equipe:
-                                        role_icon = {"superviseur": "👨‍💼", "receptionniste": "👨‍💻", "concierge": "🛎️"}
-                                        icon = role_icon.get(e['role'], "👤")
-                                        st.write(f"{icon} {e['prenom']} {e['nom']}")
-                                else:
-                                    st.write("_Aucun employé_")
+                    data_besoins.append({
+                        'Jour': jour,
+                        'Période': shift.replace('_', ' ').title(),
+                        'Personnel Total': infos['total_personnel'],
+                        'Min Superviseurs': infos['min_superviseurs'],
+                        'Concierge': infos['concierge']
+                    })
+        
+        df_besoins = pd.DataFrame(data_besoins)
+        st.dataframe(df_besoins, use_container_width=True)
+        
+        # Graphique
+        st.plotly_chart(_graphique_besoins(df_besoins), use_container_width=True)
+        
+        # Résumé
+        total_postes = int(df_besoins['Personnel Total'].sum())
+        st.info(f"📊 **Résumé**: {total_postes} postes à pourvoir sur la semaine (hors concierge)")
 
-    # === TAB 4: Analyse ===
-    with tab4:
-        st.header("📈 Analyse du Planning")
+
+
+@st.fragment
+def _onglet_planning(system):
+    """Onglet Planning, isolé dans un fragment Streamlit.
+
+    La génération met à jour le planning affiché par les onglets
+    Analyse et Export et repasse donc par un rerun complet.
+    """
+    st.header("📅 Génération du Planning")
+    
+    # Vérifications préalables avec nouvelles conditions
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        besoins_ok = 'besoins' in st.session_state
+        st.write("✅ Besoins calculés" if besoins_ok else "❌ Calculez d'abord les besoins")
+    with col2:
+        employes_disponibles = sum(e.disponible for e in system.employees)
+        equipe_ok = employes_disponibles >= 5  # Minimum viable
+        st.write(f"✅ Équipe disponible ({employes_disponibles} pers.)" if equipe_ok else f"❌ Équipe insuffisante ({employes_disponibles} pers.)")
+    with col3:
+        faisable = st.session_state.get('faisabilite', {}).get('faisable', True)
+        st.write("✅ Planning réalisable" if faisable else "❌ Planning impossible")
+
+    if not besoins_ok:
+        st.warning("⚠️ Calculez d'abord les besoins dans l'onglet 📊 Occupation.")
+    elif not equipe_ok:
+        st.error("⚠️ Équipe insuffisante. Il faut au minimum 5 personnes disponibles pour générer un planning.")
+        st.info("💡 **Solutions** : Rendez plus d'employés disponibles dans l'onglet 👥 Équipe > Gestion des Disponibilités")
+    elif not faisable:
+        st.error("⚠️ Planning impossible avec l'équipe disponible. Consultez les problèmes dans l'onglet 📊 Occupation.")
+        st.info("💡 **Solutions** : Réduisez l'occupation prévue ou augmentez l'équipe disponible")
+    else:
+        # Date de début de semaine
+        semaine_debut = st.date_input(
+            "📅 Date de début de semaine (lundi)",
+            value=datetime.now().date(),
+            help="Sélectionnez le lundi de la semaine à planifier"
+        )
         
+        if st.button("✨ Générer le Planning Optimisé", type="primary"):
+            with st.spinner("🔄 Génération du planning en cours..."):
+                try:
+                    planning = _generer_planning_cache(
+                        system,
+                        _empreinte_equipe(system),
+                        st.session_state.checkins,
+                        st.session_state.checkouts,
+                        datetime.combine(semaine_debut, datetime.min.time())
+                    )
+                    
+                    if planning:
+                        st.session_state.planning = planning
+                        st.session_state.planning_version = st.session_state.get('planning_version', 0) + 1
+                        st.session_state.semaine_debut = semaine_debut
+                        st.session_state.planning_genere = True
+                        st.rerun(scope="app")
+                    else:
+                        st.error("❌ Impossible de générer un planning valide avec les contraintes actuelles.")
+                except Exception as e:
+                    st.error(f"❌ Erreur lors de la génération: {str(e)}")
+
+        # Affichage du planning
         if 'planning' in st.session_state and st.session_state.planning:
-            analyse = system.analyser_planning(st.session_state.planning)
-            
-            # Statistiques globales
-            st.subheader("📊 Statistiques Globales")
-            stats = analyse['statistiques_globales']
-            cols = st.columns(3)
-            with cols[0]:
-                st.metric("Total shifts", stats['total_shifts_semaine'])
-            with cols[1]:
-                st.metric("Total heures", stats['total_heures_semaine'])
-            with cols[2]:
-                st.metric("Employés actifs", f"{stats['nombre_employes_actifs']}/15")
-            
-            # Analyse par employé
-            st.subheader("⏰ Analyse par Employé")
-            df_heures = pd.DataFrame.from_dict(analyse['heures_par_employe'], orient='index').reset_index()
-            df_heures.rename(columns={'index': 'Employé'}, inplace=True)
+            if st.session_state.pop('planning_genere', False):
+                st.success("✅ Planning généré avec succès!")
+            st.subheader("📋 Planning Hebdomadaire Généré")
             
-            # Coloration conditionnelle pour les violations
-            def color_violations(row):
-                colors = [''] * len(row)
-                if not row['respect_contrat']:
-                    colors = ['background-color: #ffcccc'] * len(row)
-                return colors
+            # Calcul des dates de la semaine
+            dates_semaine = _dates_semaine(semaine_debut)
             
-            st.dataframe(
-                df_heures.style.apply(color_violations, axis=1),
-                use_container_width=True
-            )
-            
-            # Graphique de répartition des heures
-            fig_heures = px.bar(df_heures, x='Employé', y='heures', color='role',
-                              title="Répartition des Heures par Employé",
-                              color_discrete_map={
-                                  'superviseur': '#FFE6CC',
-                                  'receptionniste': '#E6F3FF',
-                                  'concierge': '#E6FFE6'
-                              })
-            fig_heures.update_layout(xaxis_tickangle=45)
-            st.plotly_chart(fig_heures, use_container_width=True)
+            # Construction en colonnes : l'index inversé des présences donne
+            # pour chaque (jour, shift) un masque NumPy sur les prénoms,
+            # d'où la colonne entière en un np.where (pas de boucle cellule
+            # par cellule)
+            presences = system._index_presences(st.session_state.planning)
+            prenoms = np.array([e.prenom for e in system.employees])
+            colonnes = {
+                'Employé': [f"{e.prenom} {e.nom}" for e in system.employees],
+                'Rôle': [_libelle_role(e.role) for e in system.employees],
+                'Contrat': [_libelle_contrat(e.type_contrat) for e in system.employees],
+            }
+            sous_colonnes = (('matin', 'Matin', "🌅 M"), ('apres_midi', 'AM', "🌆 AM"), ('nuit', 'Nuit', "🌙 N"))
+            for i, jour in enumerate(system.jours_semaine):
+                date_str = dates_semaine[i]
+                presences_jour = presences[jour]
+                for shift, suffixe, icone in sous_colonnes:
+                    masque = np.isin(prenoms, list(presences_jour[shift]))
+                    colonnes[f"{jour} {date_str} - {suffixe}"] = np.where(masque, icone, "")
+
+            # Affichage du tableau
+            df_planning = pd.DataFrame(colonnes)
             
-            # Couverture par shift
-            st.subheader("👥 Couverture par Shift")
-            df_couverture = pd.DataFrame.from_dict(analyse['couverture_par_shift'], orient='index').reset_index()
-            df_couverture.rename(columns={'index': 'Jour_Shift'}, inplace=True)
+            # Colonnes des shifts (les 3 premières colonnes sont l'info employé)
+            shift_columns = list(df_planning.columns[3:])
+
+            # Style vectorisé : une passe np.select par colonne au lieu
+            # d'un rappel Python par cellule
+            styled_df = df_planning.style.apply(_styles_colonne_shift, axis=0, subset=shift_columns)
             
-            # Séparer Jour et Shift de manière sécurisée
-            split_data = df_couverture['Jour_Shift'].str.split('_', expand=True)
-            if split_data.shape[1] >= 2:
-                df_couverture['Jour'] = split_data[0]
-                df_couverture['Shift'] = split_data[1]
-            else:
-                # Fallback si le split ne fonctionne pas comme attendu
-                df_couverture['Jour'] = df_couverture['Jour_Shift']
-                df_couverture['Shift'] = 'unknown'
+            # Affichage du tableau stylé
+            st.dataframe(styled_df, use_container_width=True, height=600)
             
-            # Graphique avec détail par rôle
-            fig_couverture = px.bar(df_couverture, x='Jour', 
-                                  y=['superviseurs', 'receptionnistes', 'concierge'], 
-                                  color='Shift',
-                                  title="Composition des Équipes par Shift",
-                                  barmode='stack')
-            st.plotly_chart(fig_couverture, use_container_width=True)
+            # Résumé par shift et validation
+            st.subheader("📊 Validation du Planning")
             
-            # Détail de la couverture
-            with st.expander("📋 Détail de la couverture par shift"):
-                for jour in system.jours_semaine:
-                    st.write(f"**{jour}:**")
-                    for shift in ['matin', 'apres_midi', 'nuit']:
-                        equipe_info = analyse['couverture_par_shift'].get(f"{jour}_{shift}", {})
-                        st.write(f"  - {shift.title()}: {equipe_info.get('total', 0)} personnes "
-                               f"({equipe_info.get('superviseurs', 0)} superviseurs, "
-                               f"{equipe_info.get('receptionnistes', 0)} réceptionnistes, "
-                               f"{equipe_info.get('concierge', 0)} concierge)")
+            # Compteurs de rôles par shift : une passe partagée avec
+            # l'exporteur, plus de comprehensions par rôle. Les règles
+            # sont ensuite appliquées en algèbre booléenne sur colonnes
+            # plutôt qu'en branches Python par shift.
+            comptes = system._comptes_roles_par_shift(st.session_state.planning)
+            cles_shifts = [(jour, shift) for jour in system.jours_semaine for shift in system.SHIFTS]
+            df_validation = pd.DataFrame({
+                'Jour': np.repeat([f"{jour} {dates_semaine[i]}" for i, jour in enumerate(system.jours_semaine)],
+                                  len(system.SHIFTS)),
+                'Shift': [shift.replace('_', ' ').title() for _, shift in cles_shifts],
+                'Total': [comptes[cle].total() for cle in cles_shifts],
+                'Superviseurs': [comptes[cle]['superviseur'] for cle in cles_shifts],
+                'Réceptionnistes': [comptes[cle]['receptionniste'] for cle in cles_shifts],
+                'Concierge': [comptes[cle]['concierge'] for cle in cles_shifts],
+            })
+
+            est_nuit = np.array([shift == 'nuit' for _, shift in cles_shifts])
+            est_matin = np.array([shift == 'matin' for _, shift in cles_shifts])
+            est_apres_midi = np.array([shift == 'apres_midi' for _, shift in cles_shifts])
+            est_weekend = np.array([jour in system.WEEKEND for jour, _ in cles_shifts])
+            superviseurs = df_validation['Superviseurs']
+            receptionnistes = df_validation['Réceptionnistes']
+            concierges = df_validation['Concierge']
+
+            # (masque de violation, message) — mêmes textes et même ordre
+            # que l'ancienne validation shift par shift
+            regles = (
+                (est_nuit & (receptionnistes != 2),
+                 "Doit avoir 2 réceptionnistes (a " + receptionnistes.astype(str) + ")"),
+                (est_nuit & (superviseurs > 0), "Superviseurs interdits la nuit"),
+                (est_nuit & (concierges > 0), "Concierge interdit la nuit"),
+                (~est_nuit & (superviseurs < 1),
+                 "Doit avoir au moins 1 superviseur (a " + superviseurs.astype(str) + ")"),
+                (~est_nuit & (df_validation['Total'] > 4),
+                 "Maximum 4 personnes (a " + df_validation['Total'].astype(str) + ")"),
+                (est_matin & ~est_weekend & (concierges != 1),
+                 "Concierge obligatoire en semaine le matin (a " + concierges.astype(str) + ")"),
+                (~est_nuit & est_weekend & (concierges > 0), "Concierge interdit le weekend"),
+                (est_apres_midi & (concierges > 0), "Concierge interdit l'après-midi"),
+            )
+            viole = np.logical_or.reduce([masque.to_numpy() for masque, _ in regles])
+            textes = [pd.Series(texte, index=df_validation.index).where(masque, '')
+                      for masque, texte in regles]
+            df_validation['Statut'] = np.where(viole, '❌ Problème', '✅ OK')
+            df_validation['Détails'] = [', '.join(t for t in ligne if t) or 'Conforme'
+                                        for ligne in zip(*textes)]
+
+            styled_validation = df_validation.style.apply(_styles_validation, axis=None)
+            st.dataframe(styled_validation, use_container_width=True)
             
-            # Violations de contraintes
-            st.subheader("⚠️ Violations de Contraintes")
-            violations = analyse['violations_contraintes']
+            # Statistiques de validation
+            problemes_count = int(viole.sum())
+            total_shifts = len(df_validation)
             
-            if violations:
-                st.error(f"🚨 {len(violations)} violation(s) détectée(s):")
-                for i, violation in enumerate(violations, 1):
-                    st.write(f"{i}. {violation}")
+            if problemes_count == 0:
+                st.success(f"✅ Planning parfaitement valide ! Tous les {total_shifts} shifts respectent les contraintes.")
             else:
-                st.success("✅ Aucune violation de contrainte détectée! Le planning respecte toutes les règles.")
+                st.error(f"❌ {problemes_count} problème(s) détecté(s) sur {total_shifts} shifts.")
+            
+            # Vue par équipe pour chaque shift
+            with st.expander("👥 Composition détaillée des équipes"):
+                shifts_info = (
+                    ("🌅 Matin", 'matin'),
+                    ("🌆 Après-midi", 'apres_midi'),
+                    ("🌙 Nuit", 'nuit'),
+                )
+                for i, jour in enumerate(system.jours_semaine):
+                    date_str = dates_semaine[i]
+                    st.write(f"**{jour} {date_str}:**")
+                    cols = st.columns(3)
+
+                    for col, (titre, shift_key) in zip(cols, shifts_info):
+                        # Un seul bloc markdown par colonne : une poignée de
+                        # messages Streamlit par jour au lieu d'un par employé
+                        equipe = st.session_state.planning[jour][shift_key]
+                        lignes = [f"{_ICONES_ROLES.get(e['role'], '👤')} {e['prenom']} {e['nom']}"
+                                  for e in equipe] or ["_Aucun employé_"]
+                        col.markdown(f"*{titre}:*\n\n" + "\n\n".join(lignes))
+
+
+
+@st.fragment
+def _onglet_analyse(system):
+    """Onglet Analyse, isolé dans un fragment Streamlit
+    """
+    st.header("📈 Analyse du Planning")
+    
+    if 'planning' in st.session_state and st.session_state.planning:
+        analyse = _analyse_cache(system, st.session_state.planning,
+                                 st.session_state.get('planning_version', 0),
+                                 _empreinte_equipe(system))
+        
+        # Statistiques globales
+        st.subheader("📊 Statistiques Globales")
+        stats = analyse['statistiques_globales']
+        cols = st.columns(3)
+        with cols[0]:
+            st.metric("Total shifts", stats['total_shifts_semaine'])
+        with cols[1]:
+            st.metric("Total heures", stats['total_heures_semaine'])
+        with cols[2]:
+            st.metric("Employés actifs", f"{stats['nombre_employes_actifs']}/15")
+        
+        # Analyse par employé
+        st.subheader("⏰ Analyse par Employé")
+        df_heures = _tableau_heures(analyse, st.session_state.get('planning_version', 0),
+                                    _empreinte_equipe(system))
+        
+        # Coloration vectorisée des violations : une matrice CSS en une passe
+        st.dataframe(
+            df_heures.style.apply(_styles_heures, axis=None),
+            use_container_width=True
+        )
+        
+        # Graphique de répartition des heures
+        st.plotly_chart(_graphique_heures(df_heures), use_container_width=True)
+        
+        # Couverture par shift
+        st.subheader("👥 Couverture par Shift")
+        # Les clés (jour, shift) donnent directement les colonnes typées,
+        # sans colonne intermédiaire à re-découper
+        df_couverture = pd.DataFrame(
+            [(jour, shift, v['superviseurs'], v['receptionnistes'], v['concierge'])
+             for (jour, shift), v in analyse['couverture_par_shift'].items()],
+            columns=['Jour', 'Shift', 'superviseurs', 'receptionnistes', 'concierge'])
+        
+        # Graphique avec détail par rôle
+        st.plotly_chart(_graphique_couverture(df_couverture), use_container_width=True)
+        
+        # Détail de la couverture : un seul dataframe plutôt qu'un
+        # st.write par ligne (chaque st.write est un aller-retour avec le front)
+        with st.expander("📋 Détail de la couverture par shift"):
+            detail_couverture = pd.DataFrame([
+                {
+                    'Jour': jour,
+                    'Shift': shift.title(),
+                    'Total': equipe_info.get('total', 0),
+                    'Superviseurs': equipe_info.get('superviseurs', 0),
+                    'Réceptionnistes': equipe_info.get('receptionnistes', 0),
+                    'Concierge': equipe_info.get('concierge', 0)
+                }
+                for jour in system.jours_semaine
+                for shift in ['matin', 'apres_midi', 'nuit']
+                for equipe_info in [analyse['couverture_par_shift'].get((jour, shift), {})]
+            ])
+            st.dataframe(detail_couverture, use_container_width=True, hide_index=True)
+        
+        # Violations de contraintes
+        st.subheader("⚠️ Violations de Contraintes")
+        violations = analyse['violations_contraintes']
+        
+        if violations:
+            st.error(f"🚨 {len(violations)} violation(s) détectée(s):")
+            for i, violation in enumerate(violations, 1):
+                st.write(f"{i}. {violation}")
         else:
-            st.info("📋 Générez d'abord un planning dans l'onglet 📅 Planning pour voir l'analyse.")
+            st.success("✅ Aucune violation de contrainte détectée! Le planning respecte toutes les règles.")
+    else:
+        st.info("📋 Générez d'abord un planning dans l'onglet 📅 Planning pour voir l'analyse.")
 
-    # === TAB 5: Export ===
-    with tab5:
-        st.header("📥 Export du Planning")
+
+
+@st.fragment
+def _onglet_export(system):
+    """Onglet Export, isolé dans un fragment Streamlit
+    """
+    st.header("📥 Export du Planning")
+    
+    if 'planning' in st.session_state and st.session_state.planning:
+        st.success("✅ Planning prêt pour l'export")
         
-        if 'planning' in st.session_state and st.session_state.planning:
-            st.success("✅ Planning prêt pour l'export")
-            
-            # Informations sur l'export
-            analyse = system.analyser_planning(st.session_state.planning)
-            semaine_debut = st.session_state.get('semaine_debut', datetime.now().date())
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.info(f"📅 **Semaine du**: {semaine_debut.strftime('%d/%m/%Y')}")
-                st.info(f"👥 **Employés actifs**: {analyse['statistiques_globales']['nombre_employes_actifs']}/15")
-            with col2:
-                st.info(f"⏰ **Total heures**: {analyse['statistiques_globales']['total_heures_semaine']}h")
-                st.info(f"🔄 **Total shifts**: {analyse['statistiques_globales']['total_shifts_semaine']}")
-            
-            # Bouton d'export
-            if st.button("📊 Générer le fichier Excel", type="primary"):
-                try:
-                    with st.spinner("🔄 Génération du fichier Excel..."):
-                        excel_data = system.exporter_planning_excel(
-                            st.session_state.planning,
-                            analyse,
-                            datetime.combine(semaine_debut, datetime.min.time())
-                        )
+        # Informations sur l'export
+        analyse = _analyse_cache(system, st.session_state.planning,
+                                 st.session_state.get('planning_version', 0),
+                                 _empreinte_equipe(system))
+        semaine_debut = st.session_state.get('semaine_debut', datetime.now().date())
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.info(f"📅 **Semaine du**: {semaine_debut.strftime('%d/%m/%Y')}")
+            st.info(f"👥 **Employés actifs**: {analyse['statistiques_globales']['nombre_employes_actifs']}/15")
+        with col2:
+            st.info(f"⏰ **Total heures**: {analyse['statistiques_globales']['total_heures_semaine']}h")
+            st.info(f"🔄 **Total shifts**: {analyse['statistiques_globales']['total_shifts_semaine']}")
+        
+        # Bouton d'export
+        if st.button("📊 Générer le fichier Excel", type="primary"):
+            try:
+                with st.spinner("🔄 Génération du fichier Excel..."):
+                    excel_data = _excel_cache(
+                        system,
+                        st.session_state.planning,
+                        analyse,
+                        st.session_state.get('planning_version', 0),
+                        _empreinte_equipe(system),
+                        semaine_debut
+                    )
+                
+                # Nom du fichier
+                nom_fichier = f"planning_front_office_{semaine_debut.strftime('%Y_%m_%d')}.xlsx"
+                
+                # Bouton de téléchargement
+                st.download_button(
+                    label="💾 Télécharger le Planning Excel",
+                    data=excel_data,
+                    file_name=nom_fichier,
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+                
+                st.success("✅ Fichier Excel généré avec succès!")
+                
+                # Informations sur le contenu du fichier
+                with st.expander("📋 Contenu du fichier Excel"):
+                    st.markdown("""
+                    **Le fichier Excel contient 3 feuilles:**
                     
-                    # Nom du fichier
-                    nom_fichier = f"planning_front_office_{semaine_debut.strftime('%Y_%m_%d')}.xlsx"
+                    1. **📅 Planning Hebdomadaire** : Format tableau avec employés en lignes et jours en colonnes
+                    2. **✅ Validation** : Vérification automatique de toutes les contraintes par shift
+                    3. **📊 Analyse** : Heures par employé, violations de contraintes, statistiques globales
                     
-                    # Bouton de téléchargement
-                    st.download_button(
-                        label="💾 Télécharger le Planning Excel",
-                        data=excel_data,
-                        file_name=nom_fichier,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
+                    **Format du planning principal:**
+                    - 📋 **Tableau avec sous-colonnes** : Chaque jour divisé en 3 colonnes (Matin/AM/Nuit)
+                    - 📅 **Dates affichées** : Chaque jour avec sa date (ex: "Lundi 15/01")
+                    - 🎨 **Icônes visuelles** : 🌅 (matin), 🌆 (après-midi), 🌙 (nuit)
+                    - 🎨 **Couleurs par shift** : Jaune (matin), Rose (après-midi), Bleu (nuit)
+                    - 👨‍💼 **Distinction des rôles** : Couleurs spécifiques pour employé/rôle/contrat
                     
-                    st.success("✅ Fichier Excel généré avec succès!")
+                    **Caractéristiques de l'équipe:**
+                    - 🏨 **15 personnes au total**
+                    - 👨‍💼 **5 superviseurs** (font aussi office de réceptionnistes)
+                    - 👨‍💻 **9 réceptionnistes** (6 jour + 3 nuit)
+                    - 🛎️ **1 concierge** (5j/7, matin uniquement)
                     
-                    # Informations sur le contenu du fichier
-                    with st.expander("📋 Contenu du fichier Excel"):
-                        st.markdown("""
-                        **Le fichier Excel contient 3 feuilles:**
-                        
-                        1. **📅 Planning Hebdomadaire** : Format tableau avec employés en lignes et jours en colonnes
-                        2. **✅ Validation** : Vérification automatique de toutes les contraintes par shift
-                        3. **📊 Analyse** : Heures par employé, violations de contraintes, statistiques globales
-                        
-                        **Format du planning principal:**
-                        - 📋 **Tableau avec sous-colonnes** : Chaque jour divisé en 3 colonnes (Matin/AM/Nuit)
-                        - 📅 **Dates affichées** : Chaque jour avec sa date (ex: "Lundi 15/01")
-                        - 🎨 **Icônes visuelles** : 🌅 (matin), 🌆 (après-midi), 🌙 (nuit)
-                        - 🎨 **Couleurs par shift** : Jaune (matin), Rose (après-midi), Bleu (nuit)
-                        - 👨‍💼 **Distinction des rôles** : Couleurs spécifiques pour employé/rôle/contrat
-                        
-                        **Caractéristiques de l'équipe:**
-                        - 🏨 **15 personnes au total**
-                        - 👨‍💼 **5 superviseurs** (font aussi office de réceptionnistes)
-                        - 👨‍💻 **9 réceptionnistes** (6 jour + 3 nuit)
-                        - 🛎️ **1 concierge** (5j/7, matin uniquement)
-                        
-                        **Fonctionnalités:**
-                        - 🎨 Mise en forme professionnelle avec couleurs
-                        - ✅ Validation automatique de toutes les contraintes
-                        - 📈 Analyse détaillée des heures et de la conformité
-                        - 📋 Format tableau facile à lire et imprimer
-                        """)
-                        
-                except Exception as e:
-                    st.error(f"❌ Erreur lors de la génération du fichier Excel: {str(e)}")
-            
-            # Aperçu des violations
-            violations = analyse['violations_contraintes']
-            if violations:
-                st.warning(f"⚠️ Attention: {len(violations)} violation(s) de contrainte dans le planning")
-                with st.expander("Voir les violations"):
-                    for violation in violations:
-                        st.write(f"• {violation}")
-            else:
-                st.success("✅ Le planning respecte toutes les contraintes")
-                
+                    **Fonctionnalités:**
+                    - 🎨 Mise en forme professionnelle avec couleurs
+                    - ✅ Validation automatique de toutes les contraintes
+                    - 📈 Analyse détaillée des heures et de la conformité
+                    - 📋 Format tableau facile à lire et imprimer
+                    """)
+                    
+            except Exception as e:
+                st.error(f"❌ Erreur lors de la génération du fichier Excel: {str(e)}")
+        
+        # Aperçu des violations
+        violations = analyse['violations_contraintes']
+        if violations:
+            st.warning(f"⚠️ Attention: {len(violations)} violation(s) de contrainte dans le planning")
+            with st.expander("Voir les violations"):
+                for violation in violations:
+                    st.write(f"• {violation}")
         else:
-            st.info("📋 Générez d'abord un planning dans l'onglet 📅 Planning pour pouvoir l'exporter.")
+            st.success("✅ Le planning respecte toutes les contraintes")
             
-            # Aide pour l'export
-            with st.expander("ℹ️ Comment utiliser l'export"):
-                st.markdown("""
-                **Pour exporter votre planning:**
-                
-                1. 👥 Configurez votre équipe dans l'onglet "Équipe" (15 personnes)
-                2. 📊 Saisissez les prévisions d'occupation dans l'onglet "Occupation"
-                3. 📅 Générez le planning dans l'onglet "Planning"
-                4. 📥 Revenez ici pour télécharger le fichier Excel
-                
-                **Le fichier Excel contiendra:**
-                - Planning complet avec mise en forme
-                - Analyse détaillée des heures par employé
-                - Vérification de toutes les contraintes
-                - Planning individuel pour chaque membre de l'équipe
-                - Composition optimale : superviseurs + réceptionnistes selon les besoins
-                """)
+    else:
+        st.info("📋 Générez d'abord un planning dans l'onglet 📅 Planning pour pouvoir l'exporter.")
+        
+        # Aide pour l'export
+        with st.expander("ℹ️ Comment utiliser l'export"):
+            st.markdown("""
+            **Pour exporter votre planning:**
+            
+            1. 👥 Configurez votre équipe dans l'onglet "Équipe" (15 personnes)
+            2. 📊 Saisissez les prévisions d'occupation dans l'onglet "Occupation"
+            3. 📅 Générez le planning dans l'onglet "Planning"
+            4. 📥 Revenez ici pour télécharger le fichier Excel
+            
+            **Le fichier Excel contiendra:**
+            - Planning complet avec mise en forme
+            - Analyse détaillée des heures par employé
+            - Vérification de toutes les contraintes
+            - Planning individuel pour chaque membre de l'équipe
+            - Composition optimale : superviseurs + réceptionnistes selon les besoins
+            """)
+
+
+# ================================
+# APPLICATION STREAMLIT
+# ================================
+def main():
+    st.set_page_config(page_title="Planning Front Office Hôtelier", layout="wide")
+    st.title("🏨 Système de Planning Front Office Hôtelier")
+    st.markdown("**Optimisation des plannings avec contraintes réelles - Équipe de 15 personnes**")
+
+    if 'planning_system' not in st.session_state:
+        st.session_state.planning_system = HotelPlanningSystem()
+    # Langues ajoutées via l'interface : initialisées une seule fois ici plutôt
+    # que re-testées dans chaque expander
+    st.session_state.setdefault('langues_personnalisees', set())
+
+    system = st.session_state.planning_system
+    if not system.employees:
+        initialiser_equipe_conforme(system)
+
+    # === SIDEBAR ===
+    with st.sidebar:
+        st.header("⚙️ Configuration")
+        st.metric("Capacité hôtel", f"{system.hotel_capacity} chambres")
+        st.metric("1 réceptionniste pour", f"{system.clients_per_receptionist} clients")
+        st.metric("Max équipe par shift", f"{system.max_receptionists_per_shift} personnes")
+        
+        st.markdown("---")
+        st.markdown("**Composition équipe (15 personnes):**")
+        st.metric("Superviseurs", f"{system.nb_supervisors} (font aussi réceptionnistes)")
+        st.metric("Réceptionnistes jour", system.nb_receptionnistes_jour)
+        st.metric("Réceptionnistes nuit", f"{system.nb_night_receptionists_required}/shift")
+        st.metric("Concierge", system.nb_concierges)
+        
+        st.markdown("---")
+        st.markdown("**Contraintes principales:**")
+        st.markdown("• 2 jours off/semaine par employé")
+        st.markdown("• Max 5 jours consécutifs")
+        st.markdown("• Au moins 1 superviseur/shift jour")
+        st.markdown("• Concierge: matin seulement, off weekend")
+        st.markdown("• 2 réceptionnistes/nuit")
+
+    # === TABS ===
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["👥 Équipe", "📊 Occupation", "📅 Planning", "📈 Analyse", "📥 Export"])
+
+    # === TAB 1: Gestion Équipe ===
+    with tab1:
+        _onglet_equipe(system)
+    # === TAB 2: Prévisions ===
+    with tab2:
+        _onglet_occupation(system)
+    # === TAB 3: Planning ===
+    with tab3:
+        _onglet_planning(system)
+    # === TAB 4: Analyse ===
+    with tab4:
+        _onglet_analyse(system)
+    # === TAB 5: Export ===
+    with tab5:
+        _onglet_export(system)
 
 if __name__ == "__main__":
     main()